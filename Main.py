@@ -73,6 +73,8 @@ import os
 import subprocess
 from crawl import NewsCrawler
 from src import NewsScraper, process_csv_files
+from dedup import dedup_region
+from publication_date import DAYS_TO_CRAWL_BACK
 
 async def main():
     print("\n===== NEWS CRAWLER, SCRAPER, AND BLOG GENERATOR =====\n")
@@ -108,10 +110,10 @@ async def main():
     
     # Input 3: Language selection for blog generation
     while True:
-        language = input("In which language do you want to generate blogs? (english/hindi): ").strip().lower()
-        if language in ['english', 'hindi']:
+        language = input("In which language do you want to generate blogs? (english/hindi/both): ").strip().lower()
+        if language in ['english', 'hindi', 'both']:
             break
-        print("Invalid input. Please enter 'english' or 'hindi'.")
+        print("Invalid input. Please enter 'english', 'hindi' or 'both'.")
     
     # Confirm all selections before proceeding
     print("\n===== SELECTED OPTIONS =====")
@@ -124,7 +126,7 @@ async def main():
     # Step 1: Run the crawler to gather article URLs
     print("\n===== CRAWLING NEWS ARTICLES =====\n")
     crawler = NewsCrawler()
-    print(f"Crawling {news_type} news articles from the last 3 days...")
+    print(f"Crawling {news_type} news articles from the last {DAYS_TO_CRAWL_BACK} days...")
     articles = crawler.crawl_news(news_type)
     
     filename = f"{news_type}_news.csv"
@@ -146,21 +148,24 @@ async def main():
     await process_csv_files(input_folder, output_folder)
     
     print("\n===== CRAWLING AND SCRAPING COMPLETE =====")
-    print(f"Scraped articles are saved in the '{output_folder}' folder")
+    print(f"Scraped articles are saved in the article store as '{input_folder}' news")
+    
+    # Drop near-duplicate copies of the same story so each is generated once
+    print("\n===== REMOVING NEAR-DUPLICATE STORIES =====\n")
+    dedup_region(input_folder)
     
     # Step 3: Generate blogs in the selected language
+    # 'both' writes the English draft once and translates it, rather than running each generator
+    script = 'bilingual_blog.py' if language == 'both' else f"{language}_blog.py"
     print(f"\n===== GENERATING {language.upper()} BLOGS =====\n")
     try:
-        if language == 'english':
-            subprocess.run(['python', 'english_blog.py', output_folder], check=True)
-        else:  # hindi
-            subprocess.run(['python', 'hindi_blog.py', output_folder], check=True)
+        subprocess.run(['python', script, output_folder], check=True)
         
         print(f"\n===== {language.upper()} BLOG GENERATION COMPLETE =====")
     except subprocess.CalledProcessError as e:
         print(f"Error running the {language} blog generation script: {e}")
     except FileNotFoundError:
-        print(f"Error: {language}_blog.py script not found. Please make sure it exists in the current directory.")
+        print(f"Error: {script} script not found. Please make sure it exists in the current directory.")
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
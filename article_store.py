@@ -0,0 +1,255 @@
+#article_store.py
+
+import argparse
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from html_archive import compress, decompress
+from state_files import default_data_path
+
+# Rows fetched per query while streaming articles to a generator
+PAGE_SIZE = 50
+
+
+def region_for_folder(folder):
+    """Region label of a scraped-output folder: local_scraped -> local"""
+    name = os.path.basename(os.path.normpath(folder))
+    return name[:-len('_scraped')] if name.endswith('_scraped') else name
+
+
+def article_slug(title, max_length=50):
+    """Filesystem-safe form of an article title"""
+    safe_title = "".join(c if c.isalnum() or c in " _-" else "_" for c in title or "")
+    return safe_title[:max_length].strip() or "article"
+
+
+def article_stem(article):
+    """Unique base name for files generated from an article"""
+    return f"{article['id']:06d}_{article_slug(article['title'])}"
+
+
+def article_text(article):
+    """Article as the generators' prompts expect it: header lines, then the body"""
+    return (
+        f"Title: {article['title']}\n"
+        f"URL: {article['url']}\n"
+        f"Source: {article['source']}\n"
+        f"Original Timestamp: {article['timestamp']}\n"
+        f"Scraped Date: {article['scraped_at']}\n"
+        + "-" * 80 + "\n\n"
+        + article['content']
+    )
+
+
+class ArticleStore:
+    """SQLite store of scraped articles and of what each generator did with them.
+
+    Bodies are kept compressed. Articles carry a status ('scraped', or
+    'duplicate' once dedup has set them aside); generation results are
+    recorded per generator so English and Hindi runs each pick up only the
+    articles they have not done yet.
+    """
+    COLUMNS = ['id', 'url', 'title', 'source', 'region', 'timestamp', 'published_at', 'scraped_at', 'status']
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or default_data_path("articles.db")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE NOT NULL,
+                title TEXT,
+                source TEXT,
+                region TEXT,
+                timestamp TEXT,
+                published_at TEXT,
+                scraped_at TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'scraped',
+                codec TEXT NOT NULL,
+                body BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS articles_region ON articles (region, status);
+            CREATE INDEX IF NOT EXISTS articles_source ON articles (source);
+            CREATE INDEX IF NOT EXISTS articles_scraped_at ON articles (scraped_at);
+            CREATE TABLE IF NOT EXISTS generations (
+                article_id INTEGER NOT NULL,
+                generator TEXT NOT NULL,
+                status TEXT NOT NULL,
+                output TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (article_id, generator)
+            );
+        """)
+        # Stores created before publication dates were extracted
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(articles)")}
+        if 'published_at' not in columns:
+            self.conn.execute("ALTER TABLE articles ADD COLUMN published_at TEXT")
+        self.conn.commit()
+
+    def add(self, url, title, source, region, timestamp, content, published_at=None):
+        """Save a scraped article, replacing the body if the URL is already stored; returns its id"""
+        body, codec = compress(content.encode('utf-8'))
+        scraped_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        if published_at is not None:
+            published_at = published_at.strftime('%Y-%m-%d %H:%M:%S')
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO articles (url, title, source, region, timestamp, published_at, scraped_at, codec, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET title = excluded.title, source = excluded.source, "
+                "region = excluded.region, timestamp = excluded.timestamp, "
+                "published_at = COALESCE(excluded.published_at, articles.published_at), "
+                "scraped_at = excluded.scraped_at, codec = excluded.codec, body = excluded.body",
+                (url, title, source, region, timestamp, published_at, scraped_at, codec, body)
+            )
+            self.conn.commit()
+            return self.conn.execute("SELECT id FROM articles WHERE url = ?", (url,)).fetchone()[0]
+
+    def _row(self, row, with_content):
+        article = dict(zip(self.COLUMNS, row))
+        if with_content:
+            codec, body = row[len(self.COLUMNS):]
+            article['content'] = decompress(body, codec).decode('utf-8')
+        return article
+
+    def get(self, article_id):
+        """One article with its content, or None"""
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)}, codec, body FROM articles WHERE id = ?", (article_id,)
+            ).fetchone()
+        return self._row(row, True) if row else None
+
+    def query(self, status=None, region=None, source=None, since=None, until=None,
+              unprocessed_by=None, with_content=False):
+        """Stream matching articles in id order, a page at a time.
+
+        ``since``/``until`` bound the scrape time ('YYYY-MM-DD[ HH:MM:SS]').
+        ``unprocessed_by`` keeps only articles that generator has not yet
+        completed (failed attempts are offered again); given several
+        generators, articles any one of them has not completed.
+        """
+        conditions, params = [], []
+        for column, value in (('status', status), ('region', region), ('source', source)):
+            if value is None:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            conditions.append(f"a.{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        if since:
+            conditions.append("a.scraped_at >= ?")
+            params.append(since)
+        if until:
+            conditions.append("a.scraped_at < ?")
+            params.append(until)
+        if unprocessed_by:
+            generators = [unprocessed_by] if isinstance(unprocessed_by, str) else list(unprocessed_by)
+            conditions.append(
+                "(SELECT COUNT(*) FROM generations g WHERE g.article_id = a.id "
+                f"AND g.generator IN ({', '.join('?' * len(generators))}) AND g.status = 'done') < ?"
+            )
+            params.extend(generators + [len(generators)])
+
+        columns = ', '.join(f"a.{column}" for column in self.COLUMNS)
+        if with_content:
+            columns += ", a.codec, a.body"
+        where = ''.join(f" AND {condition}" for condition in conditions)
+
+        last_id = 0
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    f"SELECT {columns} FROM articles a WHERE a.id > ?{where} ORDER BY a.id LIMIT ?",
+                    [last_id] + params + [PAGE_SIZE]
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._row(row, with_content)
+            last_id = rows[-1][0]
+
+    def unprocessed(self, generator, region=None, source=None, since=None):
+        """Articles, with content, that still need to go through a generator (or any of several)"""
+        return self.query(status='scraped', region=region, source=source, since=since,
+                          unprocessed_by=generator, with_content=True)
+
+    def completed(self, article_id):
+        """Names of the generators that have completed an article"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT generator FROM generations WHERE article_id = ? AND status = 'done'", (article_id,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def set_status(self, article_id, status):
+        with self.lock:
+            self.conn.execute("UPDATE articles SET status = ? WHERE id = ?", (status, article_id))
+            self.conn.commit()
+
+    def mark_processed(self, article_id, generator, success, output=None):
+        """Record a generator's result for an article"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO generations (article_id, generator, status, output, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (article_id, generator, 'done' if success else 'failed', output,
+                 datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            self.conn.commit()
+
+    def counts(self):
+        """Article counts by region and status"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT region, status, COUNT(*) FROM articles GROUP BY region, status ORDER BY region, status"
+            ).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def export(store, folder, **filters):
+    """Write matching articles out as text files, one per article"""
+    os.makedirs(folder, exist_ok=True)
+    written = 0
+    for article in store.query(with_content=True, **filters):
+        with open(os.path.join(folder, f"{article_stem(article)}.txt"), 'w', encoding='utf-8') as f:
+            f.write(article_text(article))
+        written += 1
+    print(f"Exported {written} articles to {folder}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the scraped article store")
+    parser.add_argument('command', choices=['stats', 'list', 'export'])
+    parser.add_argument('--status')
+    parser.add_argument('--region')
+    parser.add_argument('--source')
+    parser.add_argument('--since', help="scraped at or after (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument('--unprocessed-by', help="only articles this generator has not done (english/hindi)")
+    parser.add_argument('--folder', default="exported_articles", help="export destination")
+    args = parser.parse_args()
+
+    store = ArticleStore()
+    filters = dict(status=args.status, region=args.region, source=args.source,
+                   since=args.since, unprocessed_by=args.unprocessed_by)
+    try:
+        if args.command == 'stats':
+            for region, status, count in store.counts():
+                print(f"{region}: {status} {count}")
+        elif args.command == 'list':
+            for article in store.query(**filters):
+                print(f"{article['id']:6d}  {article['scraped_at']}  {article['region']:10}  "
+                      f"{article['status']:9}  {article['source']}  {article['title']}")
+        else:
+            export(store, args.folder, **filters)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#bench_clean.py
+#
+# Benchmark NewsScraper's content cleaning on a fixture corpus.
+#
+#     python benchmarks/bench_clean.py [article.txt ...]
+#
+# Defaults to benchmarks/fixtures/*.txt. The original single-regex cleaner
+# is kept here as the baseline, and every fixture must clean to exactly the
+# same output with both implementations.
+
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import NOISE_PATTERNS, clean_text  # noqa: E402
+
+LEGACY_NOISE_REGEX = re.compile('|'.join(NOISE_PATTERNS), re.IGNORECASE | re.MULTILINE)
+
+def legacy_clean(content):
+    """clean_content as it was before the staged pipeline"""
+    if not content:
+        return None
+    content = LEGACY_NOISE_REGEX.sub('', content)
+    content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
+    content = re.sub(r'[ \t]+', ' ', content)
+    lines = [line.strip() for line in content.split('\n')]
+    lines = [
+        line for line in lines
+        if len(line) > 30 or re.search(r'\d{4}', line)
+        and not any(x in line.lower() for x in ['click', 'subscribe', 'follow', 'download'])
+    ]
+    seen = set()
+    unique_lines = []
+    for line in lines:
+        normalized = re.sub(r'\s+', ' ', line.lower())
+        if normalized not in seen:
+            seen.add(normalized)
+            unique_lines.append(line)
+    cleaned = '\n\n'.join(unique_lines).strip()
+    return cleaned if len(cleaned) > 200 else None
+
+def throughput(func, texts, megabytes, min_seconds=1.0):
+    runs = 0
+    started = time.perf_counter()
+    while True:
+        for text in texts:
+            func(text)
+        runs += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds:
+            return megabytes * runs / elapsed
+
+def main():
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'fixtures', '*.txt')))
+    if not paths:
+        print("No fixtures given and none found in benchmarks/fixtures")
+        return
+    
+    texts = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.append(f.read())
+    
+    mismatches = [path for path, text in zip(paths, texts) if clean_text(text) != legacy_clean(text)]
+    for path in mismatches:
+        print(f"OUTPUT DIFFERS: {path}")
+    
+    megabytes = sum(len(text.encode('utf-8')) for text in texts) / (1024 * 1024)
+    print(f"{len(texts)} fixtures, {megabytes * 1024:.0f} KB, "
+          f"{'identical output' if not mismatches else f'{len(mismatches)} mismatches'}")
+    print(f"  legacy   {throughput(legacy_clean, texts, megabytes):8.2f} MB/s")
+    print(f"  staged   {throughput(clean_text, texts, megabytes):8.2f} MB/s")
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#bench_links.py
+#
+# Benchmark section-page link extraction on saved TOI/NDTV/HT pages.
+#
+# Save section pages as benchmarks/pages/<site>_<anything>.html, where <site>
+# is one of toi, ndtv, ht or dh, then run:
+#
+#     python benchmarks/bench_links.py [page.html ...]
+#
+# The legacy per-link implementation is kept here as the baseline; both
+# implementations must return the same links.
+
+import glob
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from canonical_url import canonical_url  # noqa: E402
+from crawl import LinkExtractor, url_is_recent  # noqa: E402
+from publication_date import recent_cutoff  # noqa: E402
+
+SITES = {
+    'toi': 'https://timesofindia.indiatimes.com',
+    'ndtv': 'https://www.ndtv.com',
+    'ht': 'https://www.hindustantimes.com',
+    'dh': 'https://www.deccanherald.com',
+}
+
+def legacy_is_recent(url, cutoff):
+    """url_is_recent, compiling its patterns on every call as the original did"""
+    date_patterns = [
+        r'(\d{4})/(\d{1,2})/(\d{1,2})',
+        r'(\d{4})-(\d{1,2})-(\d{1,2})',
+        r'/(\d{4})(\d{2})(\d{2})/',
+    ]
+    for pattern in date_patterns:
+        match = re.search(pattern, url)
+        if match:
+            try:
+                year, month, day = map(int, match.groups())
+                article_date = datetime(year, month, day)
+            except ValueError:
+                continue
+            return article_date >= cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+    return True
+
+def legacy_extract(html, base_url, max_articles, cutoff):
+    """crawl_source's original link loop, filtering and deduplicating on canonical URLs as the crawler now does"""
+    found = []
+    soup = BeautifulSoup(html, 'html.parser')
+    for link in soup.find_all('a', href=True):
+        url = link['href']
+        if not url or url.startswith('javascript:') or url.startswith('#'):
+            continue
+        if not url.startswith('http'):
+            if url.startswith('/'):
+                url = base_url + url
+            else:
+                url = base_url + '/' + url
+        key = canonical_url(url)
+        domain = base_url.split('//')[1].split('/')[0]
+        if domain not in key:
+            continue
+        if any(canonical_url(u) == key for _, u in found):
+            continue
+        if '?' in key and ('search' in key.lower() or 'tag' in key.lower()):
+            continue
+        skip_patterns = ['category', 'tag/', 'author/', 'topics/', 'videos/', 'photos/', 'section/']
+        if any(pattern in key.lower() for pattern in skip_patterns):
+            continue
+        title_elem = None
+        for selector in ['h1', 'h2', 'h3', '.headline', '.title', '[class*="title"]', '[class*="heading"]']:
+            elements = link.select(selector)
+            if elements:
+                title_elem = elements[0]
+                break
+        if not title_elem:
+            title_text = link.get_text().strip()
+            if len(title_text) >= 30 and len(title_text) <= 200:
+                title_elem = link
+        if not title_elem:
+            continue
+        title = title_elem.get_text().strip()
+        if not title or len(title) < 20:
+            continue
+        if legacy_is_recent(url, cutoff):
+            found.append((title, url))
+        if len(found) >= max_articles:
+            break
+    return found
+
+def timed(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - started) / repeat
+
+def main():
+    paths = sys.argv[1:] or sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'pages', '*.html')))
+    if not paths:
+        print("No pages given and none found in benchmarks/pages")
+        return
+    
+    parsers = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        parsers.append('lxml')
+    except ImportError:
+        pass
+    
+    # Scan the whole page so every link is classified
+    max_articles = 10 ** 6
+    cutoff = recent_cutoff()
+    is_recent = lambda url: url_is_recent(url, cutoff)
+    for path in paths:
+        site = os.path.basename(path).split('_')[0]
+        base_url = SITES.get(site)
+        if base_url is None:
+            print(f"Skipping {path}: unknown site prefix '{site}'")
+            continue
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            html = f.read()
+        link_count = len(BeautifulSoup(html, 'html.parser').find_all('a', href=True))
+        
+        legacy, legacy_time = timed(lambda: legacy_extract(html, base_url, max_articles, cutoff), 3)
+        print(f"\n{os.path.basename(path)}: {link_count} links")
+        print(f"  legacy      {link_count / legacy_time:10.0f} links/sec")
+        
+        for parser in parsers:
+            extractor = LinkExtractor({'base_url': base_url}, parser=parser)
+            result, elapsed = timed(lambda: extractor.extract(html, max_articles, is_recent=is_recent), 3)
+            status = "same output" if result == legacy else "OUTPUT DIFFERS"
+            print(f"  {parser:<11} {link_count / elapsed:10.0f} links/sec  ({status})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import english_blog
+import hindi_blog
+from article_store import ArticleStore, article_stem, article_text, region_for_folder
+from blog_common import BlogConfig, WordPressConfig, WordPressPublisher, draft_english_blog
+from llm_engine import GenerationEngine
+from translation_memory import TranslationMemory
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# Languages other than English: how to translate an English draft, and how to save and publish the result
+TRANSLATIONS = {
+    hindi_blog.GENERATOR_NAME: (hindi_blog.translate_draft, hindi_blog.save_and_publish),
+}
+
+def get_source_articles(config: BlogConfig, store: ArticleStore) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """
+    Stream the local and national articles still missing a blog in at least one configured language.
+
+    Yields:
+        Tuples containing (article, category)
+    """
+    os.makedirs(config.output_folder, exist_ok=True)
+
+    for folder, category in ((config.local_input_folder, "Local"), (config.national_input_folder, "National")):
+        for article in store.unprocessed(list(config.languages), region=region_for_folder(folder)):
+            yield article, category
+
+async def publish_language(language: str, article: Dict[str, Any], category: str, config: BlogConfig,
+                           blog_content: str, post_content: Any, engine: GenerationEngine,
+                           memory: TranslationMemory) -> Tuple[bool, Optional[str]]:
+    """
+    Save and publish one language's version of an English draft.
+
+    Returns:
+        Tuple[bool, Optional[str]]: Whether it succeeded, and the output file path.
+    """
+    publisher = None if not config.wordpress else WordPressPublisher(config.wordpress, language)
+
+    if language == english_blog.GENERATOR_NAME:
+        _, success = await english_blog.save_and_publish(
+            article, category, config, blog_content, post_content, publisher
+        )
+        return success, english_blog.blog_output_path(article, config) if success else None
+
+    translate, save_and_publish = TRANSLATIONS[language]
+    try:
+        translated_content, translated_post = await translate(blog_content, post_content, engine, memory)
+        output_path = await save_and_publish(article, config, translated_content, translated_post, publisher)
+    except Exception as e:
+        logging.error(f"Error generating {language} blog for article {article['id']}: {e}")
+        return False, None
+    return True, output_path
+
+async def generate_bilingual_blog(article: Dict[str, Any], category: str, config: BlogConfig, store: ArticleStore,
+                                  engine: GenerationEngine, memory: TranslationMemory) -> Dict[str, bool]:
+    """
+    Write the English draft of an article once and fan it out to every language it still needs.
+
+    Args:
+        article (Dict[str, Any]): Article from the article store, with its content.
+        category (str): Local or National.
+        config (BlogConfig): The configuration for blog generation.
+        store (ArticleStore): Article store results are recorded in.
+        engine (GenerationEngine): Engine all LLM requests are sent through.
+        memory (TranslationMemory): Memory of previously translated segments.
+
+    Returns:
+        Dict[str, bool]: Whether each language that was due succeeded.
+    """
+    done = store.completed(article['id'])
+    languages = [language for language in config.languages if language not in done]
+    filename = article_stem(article)
+
+    try:
+        blog_content, post_content = await draft_english_blog(
+            article_text(article), filename, engine, config.single_pass
+        )
+    except Exception as e:
+        logging.error(f"Error generating blog for {filename}: {e}")
+        for language in languages:
+            store.mark_processed(article['id'], language, False)
+        return {language: False for language in languages}
+
+    results = await asyncio.gather(*(
+        publish_language(language, article, category, config, blog_content, post_content, engine, memory)
+        for language in languages
+    ))
+    for language, (success, output_path) in zip(languages, results):
+        store.mark_processed(article['id'], language, success, output_path)
+    return {language: success for language, (success, _) in zip(languages, results)}
+
+async def process_articles(config: BlogConfig, store: ArticleStore, engine: GenerationEngine,
+                           memory: TranslationMemory) -> List[Dict[str, bool]]:
+    """Generate every due language for all unprocessed articles concurrently; results are in article order."""
+
+    async def process(item: Tuple[Dict[str, Any], str]) -> Dict[str, bool]:
+        article, category = item
+        logging.info(f"Processing article {article['id']} ({article['title']}) as {category} news...")
+        return await generate_bilingual_blog(article, category, config, store, engine, memory)
+
+    return await engine.map_ordered(process, get_source_articles(config, store))
+
+def process_all_articles(config: BlogConfig, engine: Optional[GenerationEngine] = None) -> List[Dict[str, bool]]:
+    """Process every local and national article still missing a blog in one of the configured languages."""
+    unknown = set(config.languages) - {english_blog.GENERATOR_NAME} - set(TRANSLATIONS)
+    if unknown:
+        raise ValueError(f"Unsupported blog languages: {', '.join(sorted(unknown))}")
+
+    store = ArticleStore()
+    memory = TranslationMemory()
+    owns_engine = engine is None
+    engine = engine or GenerationEngine()
+
+    try:
+        results = asyncio.run(process_articles(config, store, engine, memory))
+    finally:
+        store.close()
+        memory.close()
+        if owns_engine:
+            engine.close()
+
+    if not results:
+        logging.warning("No unprocessed articles found in the article store.")
+        return results
+
+    engine.log_stats()
+    memory.log_stats()
+    for language in config.languages:
+        outcomes = [result[language] for result in results if language in result]
+        succeeded = sum(outcomes)
+        logging.info(f"{language.capitalize()}: {succeeded} blogs generated successfully, "
+                     f"{len(outcomes) - succeeded} failures.")
+    return results
+
+if __name__ == "__main__":
+    # Example configuration
+    wp_config = WordPressConfig(
+        url=os.getenv("WP_URL"),
+        username=os.getenv("WP_USERNAME"),
+        password=os.getenv("WP_PASSWORD")
+    )
+
+    config = BlogConfig(
+        wordpress=wp_config,
+        min_words=400,
+        max_words=600,
+        local_input_folder="local_scraped",
+        national_input_folder="national_scraped",
+        output_folder="generated_blogs"
+    )
+
+    logging.info("Starting bilingual blog generation process...")
+    process_all_articles(config)
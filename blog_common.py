@@ -0,0 +1,366 @@
+import logging
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, List, Tuple, Union
+from wordpress_xmlrpc import Client, WordPressPost
+from wordpress_xmlrpc.methods.posts import NewPost, GetPost
+from llm_engine import GenerationEngine
+from structured_blog import HEADINGS, blog_to_text, generate_structured_blog
+
+@dataclass
+class WordPressConfig:
+    """WordPress configuration."""
+    url: str
+    username: str
+    password: str
+    xmlrpc_path: str = "xmlrpc.php"
+
+@dataclass
+class BlogConfig:
+    """Configuration for blog generation."""
+    max_words: int = 800
+    min_words: int = 400
+    output_folder: str = "generated_blogs"
+    local_input_folder: str = "local_scraped"
+    national_input_folder: str = "national_scraped"
+    topic: Optional[str] = None
+    wordpress: Optional[WordPressConfig] = None
+    # One schema-constrained request per blog instead of a topic request followed by a blog request
+    single_pass: bool = os.getenv("BLOG_SINGLE_PASS", "1") != "0"
+    # Languages the bilingual generator writes each article in
+    languages: Tuple[str, ...] = ("english", "hindi")
+
+class BlogFormatter:
+    """Handles blog content formatting and structure."""
+    
+    @staticmethod
+    def format_title(title: str) -> str:
+        """Format the blog title without any site title or navigation."""
+        title = re.sub(r'^\*+.*?\*+\s*\n', '', title)
+        title = re.sub(r'^\*\s*About\s*\n', '', title)
+        title = re.sub(r'Title:|[\*#]', '', title).strip()
+        
+        return f'''
+            <header class="entry-header">
+                <h1 class="entry-title" style="
+                    font-size: 32px;
+                    line-height: 1.4;
+                    color: #333;
+                    margin: 40px 0 30px 0;
+                    font-weight: 700;
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
+                    text-decoration: none;
+                ">{title}</h1>
+            </header>
+        '''
+    @staticmethod
+    def format_section(title: str, content: str) -> str:
+        """Format a blog section with inline styles."""
+        title = re.sub(r'[\*#]', '', title).strip()
+        content = re.sub(r'[\*#]', '', content).strip()
+        
+        return f'''
+            <section class="blog-section" style="margin: 40px 0;">
+                <h2 style="
+                    color: #2c3e50;
+                    font-size: 24px;
+                    margin-bottom: 20px;
+                    font-weight: 600;
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
+                ">{title}</h2>
+                <div class="section-content" style="
+                    line-height: 1.8;
+                    color: #444;
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
+                ">{content}</div>
+            </section>
+        '''
+
+    @staticmethod
+    def format_introduction(section: str) -> str:
+        """Format the introduction section."""
+        intro = re.sub(r'Introduction:|[\*#]', '', section).strip()
+        return f'''
+            <div class="introduction" style="
+                font-size: 18px;
+                line-height: 1.8;
+                color: #555;
+                margin: 0 0 40px 0;
+                font-weight: 400;
+                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
+            ">{intro}</div>
+        '''
+    
+    @staticmethod
+    def format_key_points(points: List[str], heading: str = "Key Points") -> str:
+        """Format key points as a styled list."""
+        formatted_points = []
+        for point in points:
+            clean_point = re.sub(r'^[-*•]\s*', '', point).strip()
+            formatted_points.append(f'''
+                <li style="
+                    margin-bottom: 15px;
+                    line-height: 1.6;
+                    color: #444;
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
+                ">{clean_point}</li>
+            ''')
+        
+        return f'''
+            <div class="key-points" style="margin: 30px 0;">
+                <h3 style="
+                    color: #2c3e50;
+                    font-size: 22px;
+                    margin-bottom: 20px;
+                    font-weight: 600;
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
+                ">{heading}</h3>
+                <ul style="
+                    padding-left: 20px;
+                    list-style-type: disc;
+                ">{''.join(formatted_points)}</ul>
+            </div>
+        '''
+
+class WordPressPublisher:
+    """Publishes generated blogs in one language to WordPress."""
+
+    def __init__(self, config: WordPressConfig, language: str = "english"):
+        self.config = config
+        self.language = language
+        self.headings = HEADINGS[language]
+        # Log prefix, e.g. "Hindi post published"; English posts are just "Post published"
+        self.label = "" if language == "english" else f"{language.capitalize()} "
+        self.client = Client(
+            f"{config.url}/{config.xmlrpc_path}",
+            config.username,
+            config.password
+        )
+        self.formatter = BlogFormatter()
+
+    def extract_title(self, content: Union[str, Dict[str, Any]]) -> str:
+        """Post title from a structured blog or from 'Title:' in generated text."""
+        if isinstance(content, dict):
+            return content['title']
+        title_match = re.search(r'Title:(.+?)(?:\n|$)', content)
+        return title_match.group(1).strip() if title_match else content.split('\n')[0].strip()
+
+    def generate_seo_slug(self, content: Union[str, Dict[str, Any]]) -> str:
+        """Generate SEO-friendly slug."""
+        title = self.extract_title(content)
+
+        # Clean up the title
+        slug = re.sub(r'[^\w\s-]', '', title.lower())  # Remove special characters
+        slug = re.sub(r'[-\s]+', '-', slug)  # Convert spaces to hyphens
+        slug = slug.strip('-')  # Remove leading/trailing hyphens
+
+        return slug 
+
+    def format_structured(self, blog: Dict[str, Any]) -> List[str]:
+        """HTML sections for a structured blog, in reading order, with this language's headings."""
+        parts = [
+            self.formatter.format_title(blog['title']),
+            self.formatter.format_introduction(blog['introduction']),
+        ]
+        if blog['key_points']:
+            parts.append(self.formatter.format_key_points(blog['key_points'], self.headings['key_points']))
+        if blog['analysis']:
+            parts.append(self.formatter.format_section(self.headings['analysis'], blog['analysis']))
+        if blog['conclusion']:
+            parts.append(self.formatter.format_section(self.headings['conclusion'], blog['conclusion']))
+        return parts
+
+    def format_content(self, content: Union[str, Dict[str, Any]]) -> str:
+        """Format content for WordPress with inline styles.
+
+        Structured blogs are rendered field by field; plain text is split into
+        sections on blank lines and labels.
+        """
+        try:
+            if isinstance(content, dict):
+                return self.wrap_article(self.format_structured(content))
+
+            sections = content.split('\n\n')
+            formatted_parts = []
+            
+            for section in sections:
+                section = section.strip()
+                if not section:
+                    continue
+                
+                if 'Title:' in section or section.startswith('***'):
+                    formatted_parts.append(self.formatter.format_title(section))
+                elif 'Introduction:' in section:
+                    formatted_parts.append(self.formatter.format_introduction(section))
+                elif 'Key Highlights:' in section or 'Key Points:' in section:
+                    points = [p for p in section.split('\n')[1:] if p.strip()]
+                    formatted_parts.append(self.formatter.format_key_points(points))
+                elif ':' in section:
+                    title, *content = section.split(':')
+                    formatted_parts.append(self.formatter.format_section(
+                        title, ':'.join(content)
+                    ))
+                else:
+                    formatted_parts.append(f'''
+                        <p style="
+                            margin-bottom: 20px;
+                            line-height: 1.8;
+                            color: #444;
+                            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
+                        ">{section}</p>
+                    ''')
+            
+            return self.wrap_article(formatted_parts)
+            
+        except Exception as e:
+            logging.error(f"Content formatting failed: {e}")
+            return content if isinstance(content, str) else blog_to_text(content, self.headings)
+
+    @staticmethod
+    def wrap_article(formatted_parts: List[str]) -> str:
+        """Wrap formatted sections in the post container."""
+        return f'''
+                <article class="blog-post" style="
+                    max-width: 800px;
+                    margin: 0 auto;
+                    padding: 20px;
+                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
+                ">{''.join(formatted_parts)}</article>
+            '''
+
+    def publish_post(self, content: Union[str, Dict[str, Any]], categories: Optional[List[str]] = None) -> Tuple[Optional[str], Optional[str]]:
+        """Publish post to WordPress with SEO-friendly URL."""
+        try:
+            post = WordPressPost()
+
+            # Extract title from content
+            post.title = self.extract_title(content)
+            if isinstance(content, dict) and content['meta_description']:
+                post.excerpt = content['meta_description']
+
+            # Generate slug
+            post.slug = self.generate_seo_slug(content)
+
+            # Format and assign content
+            post.content = self.format_content(content)
+            post.terms_names = {'category': categories or [self.label.strip() or 'Blog']}
+            post.post_status = 'publish'
+
+            # Publish the post
+            post_id = self.client.call(NewPost(post))
+
+            # Retrieve the actual published post to get the correct slug
+            published_post = self.client.call(GetPost(post_id))
+            post_slug = published_post.slug
+            post_url = published_post.link  # This gets the correct live URL
+
+            if self.label:
+                logging.info(f"{self.label}post published successfully with ID: {post_id}")
+                logging.info(f"{self.label}Post URL: {post_url}")
+            else:
+                logging.info(f"Post published successfully with ID: {post_id}")
+                logging.info(f"Correct Post URL: {post_url}")
+
+            return post_id, post_url
+
+        except Exception as e:
+            logging.error(f"Failed to publish {self.label}post to WordPress: {e}")
+            return None, None
+
+    def generate_meta_description(self, content: str, max_length: int = 160) -> str:
+        """Generate SEO meta description from content."""
+        clean_content = re.sub(r'<[^>]+>', '', content)
+        clean_content = ' '.join(clean_content.split())
+        
+        if len(clean_content) > max_length:
+            clean_content = clean_content[:max_length]
+            clean_content = clean_content[:clean_content.rindex(' ')] + '...'
+        
+        return clean_content
+
+async def determine_blog_topic(file_content: str, engine: GenerationEngine) -> str:
+    """Uses the LLM to determine the best blog topic based on the provided content."""
+    try:
+        response = await engine.chat(
+            messages=[
+                {
+                    "role": "system", 
+                    "content": "Analyze the provided content and extract the main topic or theme."
+                },
+                {"role": "user", "content": file_content}
+            ]
+        )
+        return response.strip()
+    except Exception as e:
+        logging.error(f"Error determining blog topic: {e}")
+        return "Unknown Topic"
+
+async def draft_english_blog(file_content: str, label: str, engine: GenerationEngine,
+                             single_pass: bool = True) -> Tuple[str, Union[str, Dict[str, Any]]]:
+    """
+    Write the English blog for an article, in one structured request or as topic then blog.
+
+    Returns:
+        Tuple[str, Union[str, Dict[str, Any]]]: The blog as text, and what to publish (the structured
+        blog in single-pass mode, otherwise the text).
+    """
+    if single_pass:
+        blog = await generate_structured_blog(file_content, engine)
+        logging.info(f"Determined blog topic for {label}: {blog['topic']}")
+        return blog_to_text(blog), blog
+
+    # Determine topic (kept local: articles are generated concurrently with one config)
+    topic = await determine_blog_topic(file_content, engine)
+    logging.info(f"Determined blog topic for {label}: {topic}")
+
+    system_prompt = """\
+        You are an expert AI content analyst and writer, specializing in transforming raw data into clear, engaging, and SEO-optimized blog posts. Your task is to:
+
+        1. ANALYZE & CLEAN DATA:
+        - Extract key information from raw input
+        - Remove duplicates and redundant information
+        - Identify the most important points and insights
+
+        2. STRUCTURE THE BLOG:
+        Title: Create a clear, engaging title with primary SEO keywords
+        Introduction: Brief context-setting opening with relevant keywords naturally incorporated
+        Key Points: Main takeaways or highlights with keyword variations for better ranking
+        Analysis: Insights and implications with internal linking suggestions if applicable
+        Conclusion: Final thoughts or summary with a call-to-action (CTA) to engage readers
+
+        3. WRITING STYLE:
+        - Clear and professional tone
+        - Short, concise, and focused paragraphs
+        - Active voice
+        - No technical jargon unless necessary
+        - Engaging but factual
+        - Naturally integrate high-ranking keywords and long-tail keyword variations 
+
+        4. SEO OPTIMIZATION:
+        - Use **primary and secondary SEO keywords** naturally in headings and throughout the content
+        - Optimize **meta description** within 150-160 characters summarizing the post with keywords
+        - Maintain a **keyword density of 1-2%** without overstuffing
+        - Ensure content is structured with **proper H1, H2, and H3 tags**
+        - Include **internal links** (where applicable) to relevant blog content
+        - Use **SEO-friendly URLs** by keeping slugs concise and keyword-rich
+        - Write compelling **meta titles** under 60 characters to maximize CTR
+        - Encourage user engagement through a clear **Call-to-Action (CTA)** in the conclusion
+
+        5. FORMAT:
+        - Use clean, simple formatting
+        - No markdown symbols or special characters
+        - Clear section breaks
+        - Consistent structure throughout
+
+        Focus on delivering valuable insights in a well-organized, easy-to-read format, ensuring maximum search engine visibility. Keep the content within 300 words while maintaining high readability and engagement.
+    """
+
+    # Generate blog content
+    blog_content = await engine.chat(
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Create a blog post about: {topic}\n\nReference content: {file_content}"}
+        ]
+    )
+    return blog_content, blog_content
@@ -0,0 +1,59 @@
+#boilerplate.py
+
+import hashlib
+import threading
+
+from state_files import default_data_path, load_json_state, save_json_state
+
+
+def line_key(normalized_line):
+    """Compact fingerprint of a normalised (lowercased, whitespace-collapsed) line"""
+    return hashlib.blake2b(normalized_line.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class BoilerplateIndex:
+    """Per-domain line-frequency index used to spot site chrome.
+
+    For every domain it counts how many scraped articles contained each line.
+    Lines that show up in at least ``threshold`` of a domain's articles, once
+    ``min_articles`` have been seen, are treated as template (footers,
+    "Also read" blocks, newsletter prompts) and dropped by clean_text.
+    """
+    MAX_LINES_PER_DOMAIN = 50000
+
+    def __init__(self, path=None, min_articles=10, threshold=0.4):
+        self.path = path or default_data_path("boilerplate.json")
+        self.min_articles = min_articles
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.domains = load_json_state(self.path, "boilerplate index")
+        self.dirty = False
+
+    def template_lines(self, domain):
+        """Fingerprints of lines that are template on this domain"""
+        stats = self.domains.get(domain)
+        if not stats or stats['articles'] < self.min_articles:
+            return frozenset()
+        cutoff = stats['articles'] * self.threshold
+        return frozenset(key for key, count in stats['lines'].items() if count >= cutoff)
+
+    def add_article(self, domain, keys):
+        """Count the distinct line fingerprints of one scraped article"""
+        with self.lock:
+            stats = self.domains.setdefault(domain, {'articles': 0, 'lines': {}})
+            stats['articles'] += 1
+            lines = stats['lines']
+            for key in keys:
+                lines[key] = lines.get(key, 0) + 1
+            # Lines seen only once are almost never template; shed them first
+            if len(lines) > self.MAX_LINES_PER_DOMAIN:
+                stats['lines'] = {key: count for key, count in lines.items() if count > 1}
+            self.dirty = True
+
+    def save(self):
+        """Write the index to disk if it changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            save_json_state(self.path, self.domains)
+            self.dirty = False
@@ -0,0 +1,105 @@
+#canonical_url.py
+
+import re
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', '_gl', 'ref', 'ref_src', 'ocid', 'cmpid'}
+TRACKING_PREFIXES = ('utm_',)
+# AMP switches passed as query parameters, as (lowercased key, value)
+AMP_PARAMS = {('outputtype', 'amp'), ('amp', ''), ('amp', '1'), ('amp', 'true')}
+
+# Per-source rules, keyed by the canonical host: other hosts serving the same
+# articles, extra parameters to drop, and AMP path rewrites
+SOURCE_RULES = {
+    'timesofindia.indiatimes.com': {
+        'hosts': {'m.timesofindia.com', 'timesofindia.com', 'm.timesofindia.indiatimes.com'},
+        'params': {'from'},
+        'paths': [(re.compile(r'/amp_articleshow/'), '/articleshow/')],
+    },
+    'www.ndtv.com': {
+        'hosts': {'ndtv.com', 'm.ndtv.com', 'amp.ndtv.com'},
+        'params': {'pfrom'},
+        'paths': [(re.compile(r'/amp/\d+$'), '')],
+    },
+    'www.hindustantimes.com': {
+        'hosts': {'hindustantimes.com', 'm.hindustantimes.com'},
+        'params': set(),
+        'paths': [(re.compile(r'^/amp/'), '/'), (re.compile(r'-amp\.html$'), '.html')],
+    },
+    'www.deccanherald.com': {
+        'hosts': {'deccanherald.com', 'm.deccanherald.com'},
+        'params': set(),
+        'paths': [(re.compile(r'^/amp/'), '/')],
+    },
+}
+HOST_ALIASES = {alias: host for host, rules in SOURCE_RULES.items() for alias in rules['hosts']}
+
+# Generic AMP forms: a trailing /amp segment
+AMP_SUFFIX = re.compile(r'/amp/?$')
+MOBILE_PREFIX = re.compile(r'^(?:m|amp)\.')
+DUPLICATE_SLASHES = re.compile(r'/{2,}')
+
+
+def canonical_host(host):
+    host = host.lower().rstrip('.')
+    if host.endswith(':80') or host.endswith(':443'):
+        host = host.rsplit(':', 1)[0]
+    if host in HOST_ALIASES:
+        return HOST_ALIASES[host]
+    # Unknown m./amp. hosts: assume the desktop site lives on www.
+    if MOBILE_PREFIX.match(host):
+        return 'www.' + MOBILE_PREFIX.sub('', host)
+    return host
+
+
+@lru_cache(maxsize=8192)
+def canonical_url(url):
+    """Normalise an article URL so every variant of the same page compares equal"""
+    if not url:
+        return url
+    url = url.strip()
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        return url
+
+    host = canonical_host(parts.netloc)
+    rules = SOURCE_RULES.get(host, {'params': set(), 'paths': []})
+
+    path = DUPLICATE_SLASHES.sub('/', parts.path) or '/'
+    for pattern, replacement in rules['paths']:
+        path = pattern.sub(replacement, path)
+    path = AMP_SUFFIX.sub('', path) or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS
+        and key.lower() not in rules['params']
+        and not key.lower().startswith(TRACKING_PREFIXES)
+        and (key.lower(), value.lower()) not in AMP_PARAMS
+    )
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def same_site(host, other):
+    """Whether two canonical hosts belong to the same site, ignoring www."""
+    return host.removeprefix('www.') == other.removeprefix('www.')
+
+
+def resolve_canonical(declared, fetched_url):
+    """Canonical URL of a fetched page, honouring its <link rel=canonical>.
+
+    The declared canonical is only trusted when it stays on the same site and
+    is not the home page, a common misconfiguration on news templates.
+    """
+    fetched = canonical_url(fetched_url)
+    if not declared:
+        return fetched
+    declared = canonical_url(urljoin(fetched_url, declared))
+    declared_parts = urlsplit(declared)
+    if declared_parts.path in ('', '/') or not same_site(declared_parts.netloc, urlsplit(fetched).netloc):
+        return fetched
+    return declared
@@ -2,21 +2,282 @@
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import time
 import random
-from datetime import datetime, timedelta
+from datetime import datetime
 import re
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from url_index import SeenUrlIndex
+from state_files import load_json_state, save_json_state
+from canonical_url import canonical_url
+from publication_date import DAYS_TO_CRAWL_BACK, recent_cutoff
+
+# Parser backend for section pages. Set CRAWL_HTML_PARSER=lxml (requires
+# lxml) for faster parsing; it repairs malformed markup differently from
+# html.parser, so a few links may be classified differently.
+HTML_PARSER = os.getenv("CRAWL_HTML_PARSER", 'html.parser')
+
+DATE_PATTERNS = [
+    re.compile(r'(\d{4})/(\d{1,2})/(\d{1,2})'),  # YYYY/MM/DD
+    re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})'),  # YYYY-MM-DD
+    re.compile(r'/(\d{4})(\d{2})(\d{2})/'),      # YYYYMMDD
+]
+
+# Category pages, tag pages, etc.
+SKIP_PATTERNS = ['category', 'tag/', 'author/', 'topics/', 'videos/', 'photos/', 'section/']
+SKIP_REGEX = re.compile('|'.join(re.escape(pattern) for pattern in SKIP_PATTERNS))
+
+# Title candidates inside a link, best first. Equivalent to trying the
+# selectors h1, h2, h3, .headline, .title, [class*="title"], [class*="heading"]
+# in order, but resolved in one walk over the link's descendants.
+TITLE_TAG_RANK = {'h1': 0, 'h2': 1, 'h3': 2}
+NO_TITLE_RANK = 7
+
+def title_rank(elem):
+    """Rank of an element as a title candidate (lower is better)"""
+    rank = TITLE_TAG_RANK.get(elem.name, NO_TITLE_RANK)
+    if rank < 3:
+        return rank
+    classes = elem.get('class')
+    if not classes:
+        return rank
+    if isinstance(classes, str):
+        classes = classes.split()
+    if 'headline' in classes:
+        return 3
+    if 'title' in classes:
+        return 4
+    joined = ' '.join(classes)
+    if 'title' in joined:
+        return 5
+    if 'heading' in joined:
+        return 6
+    return rank
+
+def find_title_element(link):
+    """First element in the link matching the best-ranked title selector"""
+    best, best_rank = None, NO_TITLE_RANK
+    for elem in link.find_all(True):
+        rank = title_rank(elem)
+        if rank < best_rank:
+            best, best_rank = elem, rank
+            if rank == 0:
+                break
+    return best
+
+def url_is_recent(url, cutoff):
+    """Check a date embedded in the URL against the cutoff"""
+    for pattern in DATE_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            try:
+                year, month, day = map(int, match.groups())
+                article_date = datetime(year, month, day)
+            except ValueError:
+                continue
+            # Compare whole days: a URL only carries the date
+            return article_date >= cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    # No date in the URL: include it; the scraper checks the page's own
+    # publication date before saving
+    return True
+
+class LinkExtractor:
+    """Finds candidate article links on one source's section page.
+
+    Everything derived from the source (domain, URL prefix) is computed once
+    and reused for every link and every crawl of that source.
+    """
+    def __init__(self, source, parser=None):
+        self.source = source
+        self.base_url = source['base_url']
+        self.domain = self.base_url.split('//')[1].split('/')[0]
+        self.parser = parser or HTML_PARSER
+
+    def absolute_url(self, url):
+        """Make a relative href absolute; None for links that can't be articles.
+
+        The filters look at the canonical form, so AMP, mobile and tracking
+        variants are judged like the article itself, but the URL as linked is
+        returned: canonicalisation can produce a URL the site doesn't serve.
+        """
+        # Skip empty, javascript, and anchor links
+        if not url or url.startswith('javascript:') or url.startswith('#'):
+            return None
+        
+        # Make relative URLs absolute
+        if not url.startswith('http'):
+            if url.startswith('/'):
+                url = self.base_url + url
+            else:
+                url = self.base_url + '/' + url
+        
+        # AMP, mobile and tracking variants of one article map to one URL
+        key = canonical_url(url)
+        
+        # Only include URLs from the same domain
+        if self.domain not in key:
+            return None
+        
+        lowered = key.lower()
+        # Skip URLs with query parameters (often not articles)
+        if '?' in key and ('search' in lowered or 'tag' in lowered):
+            return None
+        if SKIP_REGEX.search(lowered):
+            return None
+        return url
+
+    def candidates(self, html):
+        """Yield every (title, url) pair on a section page that looks like an article link"""
+        soup = BeautifulSoup(html, self.parser)
+        found_urls = set()
+        
+        for link in soup.find_all('a', href=True):
+            url = self.absolute_url(link['href'])
+            if url is None:
+                continue
+            key = canonical_url(url)
+            if key in found_urls:
+                continue
+            
+            # First look for header elements within the link
+            title_elem = find_title_element(link)
+            
+            # If no header found, use the link text itself if substantial
+            if title_elem is None:
+                title_text = link.get_text().strip()
+                if 30 <= len(title_text) <= 200:  # Reasonable title length
+                    title_elem = link
+                else:
+                    continue
+            
+            title = title_elem.get_text().strip()
+            
+            # Skip if title is too short or empty
+            if len(title) < 20:
+                continue
+            
+            found_urls.add(key)
+            yield title, url
+
+    def extract(self, html, max_articles, skip_url=None, is_recent=None):
+        """Return up to max_articles (title, url) pairs from a section page"""
+        return select_links(self.candidates(html), max_articles, skip_url, is_recent)
+
+def select_links(candidates, max_articles, skip_url=None, is_recent=None):
+    """First max_articles candidate (title, url) pairs that are not skipped and look recent"""
+    found = []
+    for title, url in candidates:
+        if skip_url is not None and skip_url(url):
+            continue
+        # Check if the article seems recent based on URL
+        if is_recent is None or is_recent(url):
+            found.append((title, url))
+            # Stop if we have enough articles
+            if len(found) >= max_articles:
+                break
+    return found
+
+class DomainThrottle:
+    """Per-domain politeness delays shared by the crawl threads"""
+    def __init__(self, min_delay=1.0, max_delay=3.0):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.lock = threading.Lock()
+        self.next_allowed = {}
+
+    def wait(self, url, extra_delay=0.0):
+        """Block until a request to the url's domain is allowed, then reserve the next slot"""
+        domain = urlparse(url).netloc.lower()
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_allowed.get(domain, now)) + extra_delay
+            self.next_allowed[domain] = start + random.uniform(self.min_delay, self.max_delay)
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+
+class FeedCache:
+    """On-disk store of ETag/Last-Modified validators per feed URL.
+
+    Every candidate link of the last full response is kept alongside the
+    validators, before the seen and recency filters, so a 304 Not Modified can
+    be answered without parsing anything and still find links that were not
+    picked last time.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = load_json_state(path, "feed cache")
+        self.dirty = False
+
+    def conditional_headers(self, url):
+        """Revalidation headers for a previously fetched feed"""
+        entry = self.entries.get(url)
+        # Entries from before candidate links were cached can't answer a 304
+        if not entry or 'links' not in entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def links(self, url):
+        """Candidate (title, url) pairs of the cached version of the feed"""
+        entry = self.entries.get(url)
+        return [tuple(link) for link in entry.get('links', [])] if entry else []
+
+    def store(self, url, response, links):
+        """Remember the validators of a 200 response and its candidate links"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        with self.lock:
+            self.entries[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'links': [list(link) for link in links],
+                'fetched': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            self.dirty = True
+
+    def save(self):
+        """Write the cache to disk if it changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            save_json_state(self.path, self.entries, indent=2)
+            self.dirty = False
 
 class NewsCrawler:
-    def __init__(self):
+    def __init__(self, max_workers=8):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'DNT': '1',
         }
+        self.max_workers = max_workers
+        self.throttle = DomainThrottle()
+        
+        # One keep-alive session shared by all crawl threads
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.feed_cache = FeedCache(os.getenv("FEED_CACHE_FILE", os.path.join(".cache", "feed_cache.json")))
+        # Articles scraped in earlier runs are never queued again
+        self.seen_urls = SeenUrlIndex()
+        self.extractors = {}
         
         # Define news sources - National and State-specific
         self.sources = {
@@ -94,30 +355,18 @@ class NewsCrawler:
             ]
         }
 
-    def extract_date_from_url(self, url):
+    def extract_date_from_url(self, url, cutoff=None):
         """Try to extract date from URL to check if it's recent"""
-        date_patterns = [
-            r'(\d{4})/(\d{1,2})/(\d{1,2})',  # YYYY/MM/DD
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',  # YYYY-MM-DD
-            r'/(\d{4})(\d{2})(\d{2})/',      # YYYYMMDD
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, url)
-            if match:
-                try:
-                    year, month, day = map(int, match.groups())
-                    article_date = datetime(year, month, day)
-                    
-                    # Check if article is within last 3 days
-                    three_days_ago = datetime.now() - timedelta(days=3)
-                    if article_date >= three_days_ago:
-                        return True
-                except ValueError:
-                    continue
-        
-        # If we can't determine the date from URL, include it anyway
-        return True
+        if cutoff is None:
+            cutoff = recent_cutoff()
+        return url_is_recent(url, cutoff)
+
+    def get_extractor(self, source):
+        """Link extractor for a source, built once per crawler"""
+        extractor = self.extractors.get(source['feed_url'])
+        if extractor is None:
+            extractor = self.extractors.setdefault(source['feed_url'], LinkExtractor(source))
+        return extractor
 
     def crawl_source(self, source, max_articles=5, retries=3):
         """Crawl a specific news source"""
@@ -125,89 +374,51 @@ class NewsCrawler:
         
         for attempt in range(retries):
             try:
+                self.throttle.wait(source['feed_url'])
                 print(f"Crawling {source['name']}...")
-                response = requests.get(source['feed_url'], headers=self.headers, timeout=15)
+                response = self.session.get(
+                    source['feed_url'],
+                    headers=self.feed_cache.conditional_headers(source['feed_url']),
+                    timeout=15
+                )
                 
-                if response.status_code != 200:
+                # Feed unchanged since the last crawl: skip link extraction
+                if response.status_code == 304:
+                    candidates = self.feed_cache.links(source['feed_url'])
+                elif response.status_code == 200:
+                    candidates = list(self.get_extractor(source).candidates(response.text))
+                    self.feed_cache.store(source['feed_url'], response, candidates)
+                else:
                     print(f"Failed to fetch from {source['name']}: {response.status_code}")
-                    time.sleep(random.uniform(1, 3))
                     continue
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
+                # Evaluate "now" once per crawl rather than once per link
+                now = datetime.now()
+                cutoff = recent_cutoff(now)
+                timestamp = now.strftime('%Y-%m-%d %H:%M:%S')
                 
-                # Find all links that might be news articles
-                links = soup.find_all('a', href=True)
+                links = select_links(
+                    candidates,
+                    max_articles,
+                    # Skip articles scraped in earlier runs
+                    skip_url=lambda url: canonical_url(url) in self.seen_urls,
+                    # Cached links too: they may have aged past the cutoff since they were fetched
+                    is_recent=lambda url: self.extract_date_from_url(url, cutoff),
+                )
+                articles = [
+                    {
+                        'title': title,
+                        'url': url,
+                        'source': source['name'],
+                        'timestamp': timestamp
+                    }
+                    for title, url in links
+                ]
                 
-                # Process each link
-                for link in links:
-                    url = link['href']
-                    
-                    # Skip empty, javascript, and anchor links
-                    if not url or url.startswith('javascript:') or url.startswith('#'):
-                        continue
-                    
-                    # Make relative URLs absolute
-                    if not url.startswith('http'):
-                        if url.startswith('/'):
-                            url = source['base_url'] + url
-                        else:
-                            url = source['base_url'] + '/' + url
-                    
-                    # Only include URLs from the same domain
-                    domain = source['base_url'].split('//')[1].split('/')[0]
-                    if domain not in url:
-                        continue
-                    
-                    # Skip duplicate URLs
-                    if any(article['url'] == url for article in articles):
-                        continue
-                    
-                    # Skip URLs with query parameters (often not articles)
-                    if '?' in url and ('search' in url.lower() or 'tag' in url.lower()):
-                        continue
-                        
-                    # Skip category pages, tag pages, etc.
-                    skip_patterns = ['category', 'tag/', 'author/', 'topics/', 'videos/', 'photos/', 'section/']
-                    if any(pattern in url.lower() for pattern in skip_patterns):
-                        continue
-                    
-                    # Try to extract title
-                    # First look for header elements within the link
-                    title_elem = None
-                    for selector in ['h1', 'h2', 'h3', '.headline', '.title', '[class*="title"]', '[class*="heading"]']:
-                        elements = link.select(selector)
-                        if elements:
-                            title_elem = elements[0]
-                            break
-                    
-                    # If no header found, use the link text itself if substantial
-                    if not title_elem:
-                        title_text = link.get_text().strip()
-                        if len(title_text) >= 30 and len(title_text) <= 200:  # Reasonable title length
-                            title_elem = link
-                    
-                    # Skip if no valid title element found
-                    if not title_elem:
-                        continue
-                    
-                    title = title_elem.get_text().strip()
-                    
-                    # Skip if title is too short or empty
-                    if not title or len(title) < 20:
-                        continue
-                    
-                    # Check if the article seems recent based on URL
-                    if self.extract_date_from_url(url):
-                        articles.append({
-                            'title': title,
-                            'url': url,
-                            'source': source['name'],
-                            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
-                    
-                    # Stop if we have enough articles
-                    if len(articles) >= max_articles:
-                        break
+                if response.status_code == 304:
+                    print(f"{source['name']} not modified, {len(articles)} unseen articles among "
+                          f"{len(candidates)} cached links")
+                    return articles
                 
                 if articles:
                     print(f"Found {len(articles)} articles from {source['name']}")
@@ -215,25 +426,28 @@ class NewsCrawler:
                 else:
                     print(f"No articles found from {source['name']}, trying another source")
                 
-                time.sleep(random.uniform(1, 2))
-                
             except Exception as e:
                 print(f"Attempt {attempt+1} failed for {source['name']}: {str(e)}")
-                time.sleep(random.uniform(2, 4))
+                # Back off on this domain only; other sources keep crawling
+                self.throttle.wait(source['feed_url'], extra_delay=random.uniform(1, 2))
                 
         return articles
 
     def crawl_news(self, news_type='national'):
-        """Crawl news based on type (national or state)"""
+        """Crawl news based on type (national or state).
+
+        Every source is fetched in parallel; politeness delays are applied
+        per domain by the shared throttle rather than between sources.
+        """
+        sources = self.sources[news_type]
         all_articles = []
         
-        for source in self.sources[news_type]:
-            source_articles = self.crawl_source(source)
-            all_articles.extend(source_articles)
-            
-            # Add a small delay between sources
-            time.sleep(random.uniform(1, 3))
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(sources))) as executor:
+            # map preserves source order in the combined result
+            for source_articles in executor.map(self.crawl_source, sources):
+                all_articles.extend(source_articles)
         
+        self.feed_cache.save()
         return all_articles
 
     def save_to_csv(self, articles, filename, news_level='national'):
@@ -291,7 +505,7 @@ def main():
                 break
             print(f"Invalid state. Please enter one of: {state_names}")
     
-    print(f"\nCrawling {news_type} news articles from the last 3 days...")
+    print(f"\nCrawling {news_type} news articles from the last {DAYS_TO_CRAWL_BACK} days...")
     articles = crawler.crawl_news(news_type)
     
     filename = f"{news_type}_news.csv"
@@ -0,0 +1,220 @@
+#dedup.py
+
+import argparse
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import threading
+from array import array
+from datetime import datetime
+
+from article_store import ArticleStore, region_for_folder
+from state_files import default_data_path
+
+# MinHash signature: NUM_PERM hash minima over word shingles. For lookup the
+# signature is cut into BANDS bands of ROWS values; two articles become
+# candidates when any band matches exactly, which happens with probability
+# 1 - (1 - J**ROWS)**BANDS for Jaccard similarity J (about 0.99 at J=0.7,
+# under 0.03 at J=0.2), so only a small slice of the index is compared
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SIMILARITY_THRESHOLD = float(os.getenv("DEDUP_SIMILARITY", 0.7))
+SHINGLE_SIZE = 3
+# Below this many words the signature is too noisy to compare
+MIN_WORDS = 40
+
+MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1)  # fixed seed: signatures must be comparable across runs
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+WORD = re.compile(r'\w+')
+
+# Recorded in the article store's generations table once an article has been
+# checked, so later runs neither read nor decompress it again
+DEDUP_STAGE = 'dedup'
+
+
+def minhash(text):
+    """MinHash signature of the text's word shingles; returns (signature, word count)"""
+    words = WORD.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return None, len(words)
+    hashes = {
+        int.from_bytes(hashlib.blake2b(' '.join(words[i:i + SHINGLE_SIZE]).encode('utf-8'),
+                                       digest_size=8).digest(), 'big')
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+    signature = [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in PERMUTATIONS]
+    return signature, len(words)
+
+
+def band_keys(signature):
+    """One fingerprint per band, used as the LSH lookup key"""
+    keys = []
+    for band in range(BANDS):
+        rows = array('Q', signature[band * ROWS:(band + 1) * ROWS]).tobytes()
+        keys.append((band, hashlib.blake2b(rows, digest_size=8).hexdigest()))
+    return keys
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+class DuplicateIndex:
+    """Persistent MinHash/LSH index of articles that were kept for generation.
+
+    Only cluster representatives are indexed by band, so a lookup reads the
+    few rows sharing a band key with the new signature instead of comparing
+    against every article seen so far.
+    """
+    def __init__(self, db_path=None):
+        self.db_path = db_path or default_data_path("duplicates.db")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                id INTEGER PRIMARY KEY,
+                article_id INTEGER UNIQUE NOT NULL,
+                url TEXT,
+                source TEXT,
+                signature BLOB NOT NULL,
+                words INTEGER NOT NULL,
+                cluster INTEGER,
+                status TEXT NOT NULL,
+                added_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS signature_bands (
+                band INTEGER NOT NULL,
+                key TEXT NOT NULL,
+                signature_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS signature_bands_lookup ON signature_bands (band, key);
+        """)
+        self.conn.commit()
+
+    def known(self, article_id):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT 1 FROM signatures WHERE article_id = ?", (article_id,)
+            ).fetchone() is not None
+
+    def find(self, signature):
+        """Most similar indexed representative at or above SIMILARITY_THRESHOLD, as (id, url, similarity)"""
+        with self.lock:
+            rows = set()
+            for band, key in band_keys(signature):
+                rows.update(self.conn.execute(
+                    "SELECT s.id, s.url, s.signature FROM signature_bands b JOIN signatures s ON s.id = b.signature_id "
+                    "WHERE b.band = ? AND b.key = ?",
+                    (band, key)
+                ).fetchall())
+        best = None
+        for article_id, url, stored in rows:
+            score = similarity(signature, array('Q', stored))
+            if score >= SIMILARITY_THRESHOLD and (best is None or score > best[2]):
+                best = (article_id, url, score)
+        return best
+
+    def add(self, article_id, url, source, signature, words, cluster=None):
+        """Record an article; without a cluster it becomes a new representative"""
+        status = 'duplicate' if cluster else 'kept'
+        with self.lock:
+            cursor = self.conn.execute(
+                "INSERT OR REPLACE INTO signatures (article_id, url, source, signature, words, cluster, status, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (article_id, url, source, array('Q', signature).tobytes(), words, cluster, status,
+                 datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            signature_id = cursor.lastrowid
+            if cluster is None:
+                self.conn.execute("UPDATE signatures SET cluster = ? WHERE id = ?", (signature_id, signature_id))
+                self.conn.executemany(
+                    "INSERT INTO signature_bands (band, key, signature_id) VALUES (?, ?, ?)",
+                    [(band, key, signature_id) for band, key in band_keys(signature)]
+                )
+            self.conn.commit()
+        return signature_id
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def dedup_region(region, store=None, index=None):
+    """Mark near-duplicate articles of a region so the generators skip them.
+
+    New articles are considered longest first, so the fullest copy of a story
+    becomes the representative; copies of it, or of a story kept in an earlier
+    run, get status 'duplicate' in the article store. Only articles not yet
+    checked are read from the store.
+    """
+    owns_store, owns_index = store is None, index is None
+    store = store or ArticleStore()
+    index = index or DuplicateIndex()
+
+    candidates = []
+    too_short = 0
+    for article in store.query(status='scraped', region=region, unprocessed_by=DEDUP_STAGE, with_content=True):
+        # Signed by a run from before checks were recorded in the store
+        if index.known(article['id']):
+            store.mark_processed(article['id'], DEDUP_STAGE, True)
+            continue
+        signature, words = minhash(article['content'])
+        if words < MIN_WORDS:
+            too_short += 1
+            store.mark_processed(article['id'], DEDUP_STAGE, True)
+            continue
+        candidates.append((words, article['id'], article['url'], article['source'], signature))
+    candidates.sort(key=lambda item: item[0], reverse=True)
+
+    kept = 0
+    duplicates = []
+    for words, article_id, url, source, signature in candidates:
+        match = index.find(signature)
+        if match is None:
+            index.add(article_id, url, source, signature, words)
+            store.mark_processed(article_id, DEDUP_STAGE, True)
+            kept += 1
+            continue
+        store.set_status(article_id, 'duplicate')
+        index.add(article_id, url, source, signature, words, cluster=match[0])
+        store.mark_processed(article_id, DEDUP_STAGE, True)
+        duplicates.append((url, match[1], match[2]))
+        print(f"Near-duplicate ({match[2]:.0%} similar): {url} -> {match[1]}")
+
+    if owns_index:
+        index.close()
+    if owns_store:
+        store.close()
+
+    report = {'checked': len(candidates), 'kept': kept, 'duplicates': len(duplicates), 'too_short': too_short}
+    print(f"Dedup {region}: {kept} kept, {len(duplicates)} near-duplicates set aside, "
+          f"{too_short} too short to compare")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Set near-duplicate scraped articles aside before blog generation")
+    parser.add_argument('regions', nargs='*', default=['local', 'national'],
+                        help="regions (or their *_scraped folder names) to check")
+    args = parser.parse_args()
+    store = ArticleStore()
+    index = DuplicateIndex()
+    try:
+        for region in args.regions:
+            dedup_region(region_for_folder(region), store, index)
+    finally:
+        index.close()
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,324 +1,132 @@
+import asyncio
 import logging
-import ollama
-from typing import Dict, Any, Optional, List, Tuple
-from dataclasses import dataclass
-from wordpress_xmlrpc import Client, WordPressPost
-from wordpress_xmlrpc.methods.posts import NewPost
-from wordpress_xmlrpc.methods.media import UploadFile
-import json
+from typing import Dict, Any, Optional, List, Tuple, Union
 import os
 import re
-from datetime import datetime
-from wordpress_xmlrpc.methods.users import GetUserInfo
-from wordpress_xmlrpc.methods.posts import GetPost
+from article_store import ArticleStore, article_stem, article_text, region_for_folder
+from blog_common import BlogConfig, WordPressConfig, WordPressPublisher, determine_blog_topic
+from llm_engine import GenerationEngine
+from structured_blog import ENGLISH_HEADINGS, HINDI_HEADINGS, blog_to_text, generate_structured_blog
+from translation_memory import TranslationMemory, translate_segments
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
-@dataclass
-class WordPressConfig:
-    """WordPress configuration."""
-    url: str
-    username: str
-    password: str
-    xmlrpc_path: str = "xmlrpc.php"
-
-@dataclass
-class BlogConfig:
-    """Configuration for blog generation."""
-    max_words: int = 800
-    min_words: int = 400
-    output_folder: str = "generated_blogs"
-    local_scraped_folder: str = "local_scraped"
-    national_scraped_folder: str = "national_scraped"
-    topic: Optional[str] = None
-    wordpress: Optional[WordPressConfig] = None
-    category: str = "Hindi"  # Default category
-
-class BlogFormatter:
-    """Handles blog content formatting and structure."""
-    
-    @staticmethod
-    def format_title(title: str) -> str:
-        """Format the blog title without any site title or navigation."""
-        title = re.sub(r'^\*+.*?\*+\s*\n', '', title)
-        title = re.sub(r'^\*\s*About\s*\n', '', title)
-        title = re.sub(r'Title:|[\*#]', '', title).strip()
-        
-        return f'''
-            <header class="entry-header">
-                <h1 class="entry-title" style="
-                    font-size: 32px;
-                    line-height: 1.4;
-                    color: #333;
-                    margin: 40px 0 30px 0;
-                    font-weight: 700;
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
-                    text-decoration: none;
-                ">{title}</h1>
-            </header>
-        '''
-    
-    @staticmethod
-    def format_section(title: str, content: str) -> str:
-        """Format a blog section with inline styles."""
-        title = re.sub(r'[\*#]', '', title).strip()
-        content = re.sub(r'[\*#]', '', content).strip()
-        
-        return f'''
-            <section class="blog-section" style="margin: 40px 0;">
-                <h2 style="
-                    color: #2c3e50;
-                    font-size: 24px;
-                    margin-bottom: 20px;
-                    font-weight: 600;
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
-                ">{title}</h2>
-                <div class="section-content" style="
-                    line-height: 1.8;
-                    color: #444;
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
-                ">{content}</div>
-            </section>
-        '''
-
-    @staticmethod
-    def format_introduction(section: str) -> str:
-        """Format the introduction section."""
-        intro = re.sub(r'Introduction:|[\*#]', '', section).strip()
-        return f'''
-            <div class="introduction" style="
-                font-size: 18px;
-                line-height: 1.8;
-                color: #555;
-                margin: 0 0 40px 0;
-                font-weight: 400;
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
-            ">{intro}</div>
-        '''
-    
-    @staticmethod
-    def format_key_points(points: List[str]) -> str:
-        """Format key points as a styled list."""
-        formatted_points = []
-        for point in points:
-            clean_point = re.sub(r'^[-*•]\s*', '', point).strip()
-            formatted_points.append(f'''
-                <li style="
-                    margin-bottom: 15px;
-                    line-height: 1.6;
-                    color: #444;
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
-                ">{clean_point}</li>
-            ''')
-        
-        return f'''
-            <div class="key-points" style="margin: 30px 0;">
-                <h3 style="
-                    color: #2c3e50;
-                    font-size: 22px;
-                    margin-bottom: 20px;
-                    font-weight: 600;
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
-                ">Key Points</h3>
-                <ul style="
-                    padding-left: 20px;
-                    list-style-type: disc;
-                ">{''.join(formatted_points)}</ul>
-            </div>
-        '''
-
-class WordPressPublisher:
-    def __init__(self, config: WordPressConfig):
-        self.config = config
-        self.client = Client(
-            f"{config.url}/{config.xmlrpc_path}",
-            config.username,
-            config.password
-        )
-        self.formatter = BlogFormatter()
-
-    def generate_seo_slug(self, content: str) -> str:
-        """Generate SEO-friendly slug."""
-        title_match = re.search(r'Title:(.+?)(?:\n|$)', content)
-        title = title_match.group(1).strip() if title_match else content.split('\n')[0].strip()
-
-        # Clean up the title
-        slug = re.sub(r'[^\w\s-]', '', title.lower())  # Remove special characters
-        slug = re.sub(r'[-\s]+', '-', slug)  # Convert spaces to hyphens
-        slug = slug.strip('-')  # Remove leading/trailing hyphens
-
-        return slug 
-
-    def format_content(self, content: str) -> str:
-        """Format content for WordPress with inline styles."""
-        try:
-            sections = content.split('\n\n')
-            formatted_parts = []
-            
-            for section in sections:
-                section = section.strip()
-                if not section:
-                    continue
-                
-                if 'Title:' in section or section.startswith('***'):
-                    formatted_parts.append(self.formatter.format_title(section))
-                elif 'Introduction:' in section:
-                    formatted_parts.append(self.formatter.format_introduction(section))
-                elif 'Key Highlights:' in section or 'Key Points:' in section:
-                    points = [p for p in section.split('\n')[1:] if p.strip()]
-                    formatted_parts.append(self.formatter.format_key_points(points))
-                elif ':' in section:
-                    title, *content = section.split(':')
-                    formatted_parts.append(self.formatter.format_section(
-                        title, ':'.join(content)
-                    ))
-                else:
-                    formatted_parts.append(f'''
-                        <p style="
-                            margin-bottom: 20px;
-                            line-height: 1.8;
-                            color: #444;
-                            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
-                        ">{section}</p>
-                    ''')
-            
-            return f'''
-                <article class="blog-post" style="
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen-Sans, Ubuntu, Cantarell, 'Helvetica Neue', sans-serif;
-                ">{''.join(formatted_parts)}</article>
-            '''
-            
-        except Exception as e:
-            logging.error(f"Content formatting failed: {e}")
-            return content
-
-    def publish_post(self, content: str, categories: List[str] = ['Hindi']) -> Tuple[Optional[str], Optional[str]]:
-        """Publish post to WordPress with SEO-friendly URL."""
-        try:
-            post = WordPressPost()
-
-            # Extract title from content
-            title_match = re.search(r'Title:(.+?)(?:\n|$)', content)
-            post.title = title_match.group(1).strip() if title_match else content.split('\n')[0].strip()
-
-            # Generate slug
-            post.slug = self.generate_seo_slug(content)
-
-            # Format and assign content
-            post.content = self.format_content(content)
-            post.terms_names = {'category': categories}
-            post.post_status = 'publish'
-
-            # Publish the post
-            post_id = self.client.call(NewPost(post))
-
-            # Retrieve the actual published post to get the correct slug
-            published_post = self.client.call(GetPost(post_id))
-            post_slug = published_post.slug
-            post_url = published_post.link  # This gets the correct live URL
-
-            logging.info(f"Hindi post published successfully with ID: {post_id}")
-            logging.info(f"Hindi Post URL: {post_url}")
-
-            return post_id, post_url
-
-        except Exception as e:
-            logging.error(f"Failed to publish Hindi post to WordPress: {e}")
-            return None, None
-
-def read_text_file(file_path: str) -> str:
-    """Reads content from the provided text file."""
-    try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            return file.read()
-    except FileNotFoundError:
-        return "Error: The file was not found."
-    except Exception as e:
-        return f"An error occurred: {e}"
+GENERATOR_NAME = "hindi"
 
-def determine_blog_topic(file_content: str) -> str:
-    """Uses the LLM to determine the best blog topic based on the provided content."""
-    try:
-        response = ollama.chat(
-            model="llama3.1:8b",
-            messages=[
-                {
-                    "role": "system", 
-                    "content": "Analyze the provided content and extract the main topic or theme."
-                },
-                {"role": "user", "content": file_content}
-            ]
-        )
-        return response.message.content.strip()
-    except Exception as e:
-        logging.error(f"Error determining blog topic: {e}")
-        return "Unknown Topic"
+# A bullet or number at the start of a line, and one of the section labels the
+# generator writes, such as "Key Points:". Only known labels count: prose like
+# "The Chief Minister said: ..." must stay one segment.
+LINE_PREFIX = re.compile(r'^(\s*(?:[-*•]|\d+[.)])?\s*)(.*)$')
+SECTION_LABEL = re.compile(
+    r'^(' + '|'.join(re.escape(heading) for heading in ENGLISH_HEADINGS.values()) + r'):\s*(.*)$',
+    re.IGNORECASE
+)
 
-def translate_to_hindi(content: str) -> str:
+async def translate_to_hindi(content: str, engine: GenerationEngine, memory: TranslationMemory) -> str:
     """
-    Translates the provided content into Hindi using the LLM.
+    Translates the provided content into Hindi using the LLM, one line at a time.
+
+    Section labels are translated separately from the text after them, so
+    recurring ones come from the translation memory.
 
     Args:
         content (str): The English content to be translated.
+        engine (GenerationEngine): Engine the requests are sent through.
+        memory (TranslationMemory): Memory of previously translated segments.
 
     Returns:
         str: The Hindi translated content.
+
+    Raises:
+        Exception: If any segment could not be translated.
     """
-    try:
-        response = ollama.chat(
-            model="llama3.1:8b",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a highly accurate translation model. "
-                        "Translate the following English text into Hindi, ensuring the tone, context, and meaning are preserved:"
-                        "Heading:"
-                            "Font: Larger and Bolder (e.g., 24px, Bold)"
-                            "Example:"
-                            "भारत में तकनीकी विकास"
-                            "Body:"
-
-                            "Font: Smaller and Regular (e.g., 16px, Regular)"
-                            "Example:"
-                                "भारत में तकनीकी विकास तेजी से बढ़ रहा है। यह शिक्षा, स्वास्थ्य और अन्य क्षेत्रों में नई संभावनाएँ उत्पन्न कर रहा है।"
-                    )
-                },
-                {"role": "user", "content": content}
-            ]
-        )
-        translated_content = response.message.content.strip()
-        return translated_content
-    except Exception as e:
-        logging.error(f"Error during Hindi translation: {e}")
-        return "Error: Could not perform translation."
+    segments: List[str] = []
+    layout = []
+    for line in content.splitlines():
+        prefix, text = LINE_PREFIX.match(line).groups()
+        label_match = SECTION_LABEL.match(text)
+        label, text = label_match.groups() if label_match else (None, text)
+        if label is not None:
+            segments.append(label)
+        segments.append(text)
+        layout.append((prefix, label is not None))
+
+    # A failed segment raises, so the article is recorded as failed and retried
+    translated = iter(await translate_segments(segments, engine, memory))
+
+    lines = []
+    for prefix, has_label in layout:
+        label = f"{next(translated)}: " if has_label else ""
+        lines.append(f"{prefix}{label}{next(translated)}".rstrip())
+    return "\n".join(lines).strip()
+
+async def translate_blog_to_hindi(blog: Dict[str, Any], engine: GenerationEngine,
+                                  memory: TranslationMemory) -> Dict[str, Any]:
+    """
+    Translates a structured blog into Hindi paragraph by paragraph, keeping its structure.
 
-def generate_hindi_blog_from_file(file_path: str, config: BlogConfig) -> Tuple[str, bool, str]:
+    Args:
+        blog (Dict[str, Any]): The structured English blog.
+        engine (GenerationEngine): Engine the requests are sent through.
+        memory (TranslationMemory): Memory of previously translated segments.
+
+    Returns:
+        Dict[str, Any]: The structured Hindi blog.
     """
-    Generate blog content in English, translate to Hindi, and optionally publish only the Hindi version.
+    fields = ("title", "meta_description", "introduction", "analysis", "conclusion")
+    paragraphs = {name: [p.strip() for p in blog[name].split("\n\n") if p.strip()] for name in fields}
+    segments = [p for name in fields for p in paragraphs[name]] + blog["key_points"]
+
+    translated = iter(await translate_segments(segments, engine, memory))
+    hindi_blog = {name: "\n\n".join(next(translated) for _ in paragraphs[name]) for name in fields}
+    hindi_blog["key_points"] = list(translated)
+    hindi_blog["topic"] = blog["topic"]
+    return hindi_blog
+
+async def translate_draft(blog_content: str, post_content: Union[str, Dict[str, Any]], engine: GenerationEngine,
+                          memory: TranslationMemory) -> Tuple[str, Union[str, Dict[str, Any]]]:
+    """
+    Hindi version of an English draft.
 
     Args:
-        file_path (str): Path to the input file.
-        config (BlogConfig): The configuration for the blog generation.
+        blog_content (str): The English blog as text.
+        post_content (Union[str, Dict[str, Any]]): The structured English blog, or the text again.
+        engine (GenerationEngine): Engine the requests are sent through.
+        memory (TranslationMemory): Memory of previously translated segments.
 
     Returns:
-        Tuple[str, bool, str]: Tuple containing the Hindi blog content, whether the operation succeeded, and the output file path.
+        Tuple[str, Union[str, Dict[str, Any]]]: The Hindi blog as text, and what to publish.
+    """
+    if isinstance(post_content, dict):
+        hindi_blog = await translate_blog_to_hindi(post_content, engine, memory)
+        return blog_to_text(hindi_blog, HINDI_HEADINGS), hindi_blog
+    hindi_translation = await translate_to_hindi(blog_content, engine, memory)
+    return hindi_translation, hindi_translation
+
+async def draft_hindi_blog(file_content: str, label: str, engine: GenerationEngine,
+                           memory: TranslationMemory) -> Tuple[str, Union[str, Dict[str, Any]]]:
+    """
+    Write the English blog in one structured request and translate it to Hindi.
+
+    Returns:
+        Tuple[str, Union[str, Dict[str, Any]]]: The Hindi blog as text, and the structured blog to publish.
     """
-    wordpress_publisher = None if not config.wordpress else WordPressPublisher(config.wordpress)
+    blog = await generate_structured_blog(file_content, engine)
+    logging.info(f"Determined blog topic from {label}: {blog['topic']}")
+    return await translate_draft(blog_to_text(blog), blog, engine, memory)
 
-    # Read content from input file
-    file_content = read_text_file(file_path)
-    if "Error" in file_content:
-        logging.error(f"Could not read input file {file_path}. Skipping.")
-        return file_content, False, ""
+async def draft_hindi_blog_two_pass(file_content: str, label: str, engine: GenerationEngine,
+                                    memory: TranslationMemory) -> Tuple[str, Union[str, Dict[str, Any]]]:
+    """
+    Determine the topic, write the English blog, then translate it to Hindi, one request each.
 
+    Returns:
+        Tuple[str, Union[str, Dict[str, Any]]]: The Hindi blog as text, twice (it is published as text).
+    """
     # Determine topic
-    topic = determine_blog_topic(file_content)
-    logging.info(f"Determined blog topic from {file_path}: {topic}")
+    topic = await determine_blog_topic(file_content, engine)
+    logging.info(f"Determined blog topic from {label}: {topic}")
 
     # Generate blog content in English (intermediate step)
     system_prompt = (
@@ -330,29 +138,66 @@ def generate_hindi_blog_from_file(file_path: str, config: BlogConfig) -> Tuple[s
         "Analysis: Insights and implications with internal linking suggestions if applicable"
         "Conclusion: Final thoughts or summary with a call-to-action (CTA) to engage readers"
     )
+    response = await engine.chat(
+        messages=[
+            {
+                "role": "system",
+                "content": system_prompt
+            },
+            {"role": "user", "content": f"Create a blog post about: {topic}\n\nReference content: {file_content}"}
+        ]
+    )
+    blog_content = response.strip()
+    logging.info(f"Generated English blog content for {label} as intermediate step.")
+
+    # Translate blog content to Hindi
+    return await translate_draft(blog_content, blog_content, engine, memory)
+
+async def generate_hindi_blog(article: Dict[str, Any], config: BlogConfig, engine: GenerationEngine,
+                              memory: TranslationMemory) -> Tuple[str, bool, str]:
+    """
+    Generate blog content in English, translate to Hindi, and optionally publish only the Hindi version.
+
+    Args:
+        article (Dict[str, Any]): Article from the article store, with its content.
+        config (BlogConfig): The configuration for the blog generation.
+        engine (GenerationEngine): Engine all LLM requests are sent through.
+        memory (TranslationMemory): Memory of previously translated segments.
+
+    Returns:
+        Tuple[str, bool, str]: Tuple containing the Hindi blog content, whether the operation succeeded, and the output file path.
+    """
+    wordpress_publisher = None if not config.wordpress else WordPressPublisher(config.wordpress, "hindi")
+
+    file_content = article_text(article)
+    label = f"article {article['id']}"
+
+    draft = draft_hindi_blog if config.single_pass else draft_hindi_blog_two_pass
     try:
-        response = ollama.chat(
-            model="llama3.1:8b",
-            messages=[
-                {
-                    "role": "system",
-                    "content": system_prompt
-                },
-                {"role": "user", "content": f"Create a blog post about: {topic}\n\nReference content: {file_content}"}
-            ]
-        )
-        blog_content = response.message.content.strip()
-        logging.info(f"Generated English blog content for {file_path} as intermediate step.")
+        hindi_translation, post_content = await draft(file_content, label, engine, memory)
     except Exception as e:
-        logging.error(f"Error generating blog content for {file_path}: {e}")
+        logging.error(f"Error generating blog content for {label}: {e}")
         return "Error: Blog generation failed.", False, ""
+    logging.info(f"Successfully translated blog content from {label} to Hindi.")
 
-    # Translate blog content to Hindi
-    hindi_translation = translate_to_hindi(blog_content)
-    logging.info(f"Successfully translated blog content from {file_path} to Hindi.")
+    try:
+        output_file_path = await save_and_publish(article, config, hindi_translation, post_content, wordpress_publisher)
+    except Exception as e:
+        logging.error(f"Error saving blog for {label}: {e}")
+        return "Error: Blog publishing failed.", False, ""
+    return hindi_translation, True, output_file_path
+
+async def save_and_publish(article: Dict[str, Any], config: BlogConfig, hindi_translation: str,
+                           post_content: Union[str, Dict[str, Any]],
+                           wordpress_publisher: Optional[WordPressPublisher]) -> str:
+    """Write a Hindi blog to the output folder, publish it to WordPress if configured, and return its path.
+
+    Raises if the WordPress publish fails.
+    """
+    label = f"article {article['id']}"
 
-    # Get file name without extension
-    file_name = os.path.splitext(os.path.basename(file_path))[0]
+    # Output names come from the article id, so concurrent runs never collide
+    file_name = article_stem(article)
     
     # Create output folder if it doesn't exist
     os.makedirs(config.output_folder, exist_ok=True)
@@ -365,77 +210,100 @@ def generate_hindi_blog_from_file(file_path: str, config: BlogConfig) -> Tuple[s
         hindi_file.write(hindi_translation)
     logging.info(f"Hindi blog saved to {output_file_path}")
 
-    # Determine category based on folder
+    # Determine category based on the article's region
     categories = ["Hindi", "Blog"]
-    if "local" in file_path.lower():
+    if article['region'] == "local":
         categories.append("Local News")
-    elif "national" in file_path.lower():
+    elif article['region'] == "national":
         categories.append("National News")
 
     # Optionally publish to WordPress (Hindi only)
     if wordpress_publisher:
-        post_id, post_url = wordpress_publisher.publish_post(
-            hindi_translation,
+        post_id, post_url = await asyncio.to_thread(
+            wordpress_publisher.publish_post,
+            post_content,
             categories=categories
         )
-        if post_id:
-            logging.info(f"Hindi blog from {file_path} published successfully with ID: {post_id}")
-            logging.info(f"Post URL: {post_url}")
-        else:
-            logging.error(f"Failed to publish Hindi blog from {file_path} to WordPress")
+        if not post_id:
+            # Raised rather than logged, so the article is not marked done and the next run retries
+            raise RuntimeError(f"Failed to publish Hindi blog from {label} to WordPress")
+        logging.info(f"Hindi blog from {label} published successfully with ID: {post_id}")
+        logging.info(f"Post URL: {post_url}")
 
-    return hindi_translation, True, output_file_path
+    return output_file_path
 
-def process_folder(folder_path: str, config: BlogConfig) -> List[Tuple[str, bool, str]]:
+async def process_folder(folder_path: str, config: BlogConfig, store: ArticleStore,
+                         engine: GenerationEngine, memory: TranslationMemory) -> List[Tuple[str, bool, str]]:
     """
-    Process all text files in a folder.
+    Process the stored articles of a scraped folder's region that have no Hindi blog yet.
+
+    Articles are generated concurrently, up to the engine's limit on in-flight
+    LLM requests; results come back in article order.
 
     Args:
-        folder_path (str): Path to the folder containing text files.
+        folder_path (str): Scraped folder name; its region selects the articles.
         config (BlogConfig): The configuration for blog generation.
+        store (ArticleStore): Article store to stream articles from and record results in.
+        engine (GenerationEngine): Engine all LLM requests are sent through.
+        memory (TranslationMemory): Memory of previously translated segments.
 
     Returns:
         List[Tuple[str, bool, str]]: List of tuples containing the Hindi blog content, 
                                    whether the operation succeeded, and the output file path.
     """
-    results = []
-    
-    if not os.path.exists(folder_path):
-        logging.warning(f"Folder {folder_path} does not exist. Skipping.")
-        return results
+    async def process(article: Dict[str, Any]) -> Tuple[str, bool, str]:
+        logging.info(f"Processing article {article['id']}: {article['title']}")
         
-    for file_name in os.listdir(folder_path):
-        if file_name.endswith(".txt"):
-            file_path = os.path.join(folder_path, file_name)
-            logging.info(f"Processing file: {file_path}")
-            
-            hindi_blog, success, output_path = generate_hindi_blog_from_file(file_path, config)
-            results.append((hindi_blog, success, output_path))
-            
+        hindi_blog, success, output_path = await generate_hindi_blog(article, config, engine, memory)
+        store.mark_processed(article['id'], GENERATOR_NAME, success, output_path or None)
+        return hindi_blog, success, output_path
+    
+    return await engine.map_ordered(
+        process, store.unprocessed(GENERATOR_NAME, region=region_for_folder(folder_path))
+    )
+
+async def process_folders(config: BlogConfig, store: ArticleStore, engine: GenerationEngine,
+                          memory: TranslationMemory) -> Dict[str, List[Tuple[str, bool, str]]]:
+    """Process the local and then the national articles."""
+    results = {}
+    
+    # Process local scraped content
+    logging.info(f"Processing local scraped content from {config.local_input_folder}")
+    results["local"] = await process_folder(config.local_input_folder, config, store, engine, memory)
+    
+    # Process national scraped content
+    logging.info(f"Processing national scraped content from {config.national_input_folder}")
+    results["national"] = await process_folder(config.national_input_folder, config, store, engine, memory)
+    
     return results
 
-def process_all_folders(config: BlogConfig) -> Dict[str, List[Tuple[str, bool, str]]]:
+def process_all_folders(config: BlogConfig,
+                        engine: Optional[GenerationEngine] = None) -> Dict[str, List[Tuple[str, bool, str]]]:
     """
     Process all folders specified in the config.
 
     Args:
         config (BlogConfig): The configuration for blog generation.
+        engine (Optional[GenerationEngine]): Engine for LLM requests; one is created if omitted.
 
     Returns:
         Dict[str, List[Tuple[str, bool, str]]]: Dictionary mapping folder names to results.
     """
-    results = {}
+    store = ArticleStore()
+    memory = TranslationMemory()
+    owns_engine = engine is None
+    engine = engine or GenerationEngine()
     
-    # Process local scraped content
-    logging.info(f"Processing local scraped content from {config.local_scraped_folder}")
-    local_results = process_folder(config.local_scraped_folder, config)
-    results["local"] = local_results
-    
-    # Process national scraped content
-    logging.info(f"Processing national scraped content from {config.national_scraped_folder}")
-    national_results = process_folder(config.national_scraped_folder, config)
-    results["national"] = national_results
+    try:
+        results = asyncio.run(process_folders(config, store, engine, memory))
+    finally:
+        store.close()
+        memory.close()
+        if owns_engine:
+            engine.close()
     
+    engine.log_stats()
+    memory.log_stats()
     return results
 
 if __name__ == "__main__":
@@ -448,8 +316,8 @@ if __name__ == "__main__":
     
     config = BlogConfig(
         wordpress=wp_config,
-        local_scraped_folder="local_scraped",
-        national_scraped_folder="national_scraped",
+        local_input_folder="local_scraped",
+        national_input_folder="national_scraped",
         output_folder="generated_blogs",
         min_words=400,
         max_words=600
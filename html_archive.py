@@ -0,0 +1,125 @@
+#html_archive.py
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from state_files import default_data_path
+
+try:
+    import zstandard
+except ImportError:  # fall back to gzip blobs without zstandard
+    zstandard = None
+
+
+def compress(data):
+    """Compress bytes with zstd when available; returns (blob, codec)"""
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(data), 'zstd'
+    return gzip.compress(data, compresslevel=6), 'gzip'
+
+
+def decompress(blob, codec):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd archive entries")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    if codec == 'gzip':
+        return gzip.decompress(blob)
+    raise ValueError(f"Unknown archive codec: {codec}")
+
+
+def object_path(root, digest, codec):
+    """Path of an archived blob under an archive root"""
+    extension = 'zst' if codec == 'zstd' else 'gz'
+    return os.path.join(root, "objects", digest[:2], f"{digest}.{extension}")
+
+
+def read_object(root, digest, codec):
+    """Decompressed HTML of an archived blob, read straight from disk without opening the index"""
+    with open(object_path(root, digest, codec), 'rb') as f:
+        return decompress(f.read(), codec).decode('utf-8')
+
+
+class HtmlArchive:
+    """Content-addressed archive of fetched article HTML.
+
+    Each distinct page body is compressed once and stored under its SHA-256
+    digest; an SQLite index maps (url, fetch time) to the digest together with
+    what is needed to save the article again (title, source, output folder).
+    """
+    def __init__(self, root=None):
+        self.root = root or default_data_path("html_archive")
+        self.objects_dir = os.path.join(self.root, "objects")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(self.root, "index.db"), check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                codec TEXT NOT NULL,
+                title TEXT,
+                source TEXT,
+                timestamp TEXT,
+                output_dir TEXT
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pages_url ON pages (url, fetched_at)")
+        self.conn.commit()
+
+    def object_path(self, digest, codec):
+        return object_path(self.root, digest, codec)
+
+    def store(self, url, html, title=None, source=None, timestamp=None, output_dir=None):
+        """Archive one fetched page; identical bodies share a single blob"""
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        codec = 'zstd' if zstandard is not None else 'gzip'
+        path = self.object_path(digest, codec)
+        if not os.path.exists(path):
+            blob, codec = compress(data)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO pages (url, fetched_at, digest, codec, title, source, timestamp, output_dir) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), digest, codec,
+                 title, source, timestamp, output_dir)
+            )
+            self.conn.commit()
+        return digest
+
+    def read(self, digest, codec):
+        """Decompressed HTML of an archived page"""
+        return read_object(self.root, digest, codec)
+
+    def latest_pages(self, since=None):
+        """Most recent archived fetch of every URL, as dicts"""
+        query = """
+            SELECT url, MAX(fetched_at), digest, codec, title, source, timestamp, output_dir
+            FROM pages
+        """
+        params = ()
+        if since:
+            query += " WHERE fetched_at >= ?"
+            params = (since,)
+        query += " GROUP BY url ORDER BY MAX(fetched_at)"
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        columns = ['url', 'fetched_at', 'digest', 'codec', 'title', 'source', 'timestamp', 'output_dir']
+        return [dict(zip(columns, row)) for row in rows]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
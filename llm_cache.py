@@ -0,0 +1,144 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from state_files import default_data_path
+
+
+def text_digest(text: str) -> str:
+    """SHA-256 hex digest of a string, used as a stable lookup key"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def cache_key(model: str, messages: List[Dict[str, str]], options: Dict[str, Any]) -> str:
+    """Key for one chat request: model, system prompt hash, user message hash and request options."""
+    system = "\n".join(m["content"] for m in messages if m["role"] == "system")
+    conversation = json.dumps([m for m in messages if m["role"] != "system"], sort_keys=True, ensure_ascii=False)
+    return text_digest(json.dumps(
+        [model, text_digest(system), text_digest(conversation), options],
+        sort_keys=True, ensure_ascii=False, default=str,
+    ))
+
+
+class ResponseCache:
+    """Persistent cache of LLM replies, so re-runs skip work that was already done.
+
+    Entries older than ``max_age_days`` are dropped, and once the cache holds
+    more than ``max_mb`` of replies the least recently used ones go first.
+    With ``bypass`` set, lookups always miss but fresh replies are still
+    stored, which refreshes the cache.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_mb: Optional[float] = None,
+                 max_age_days: Optional[float] = None, bypass: Optional[bool] = None):
+        self.path = path or default_data_path("llm_cache.db")
+        self.max_bytes = int((max_mb or float(os.getenv("LLM_CACHE_MAX_MB", 200))) * 1024 * 1024)
+        self.max_age = (max_age_days or float(os.getenv("LLM_CACHE_MAX_AGE_DAYS", 30))) * 86400
+        self.bypass = os.getenv("LLM_CACHE_BYPASS", "0") == "1" if bypass is None else bypass
+        self.stats = {"hits": 0, "misses": 0, "stored": 0}
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self.conn.commit()
+        self.evict()
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached reply for a request key, or None."""
+        if self.bypass:
+            self.stats["misses"] += 1
+            return None
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at >= ?", (key, now - self.max_age)
+            ).fetchone()
+            if row:
+                self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                self.conn.commit()
+        self.stats["hits" if row else "misses"] += 1
+        return row[0] if row else None
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """Store a reply."""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, len(response.encode("utf-8")), now, now),
+            )
+            self.conn.commit()
+        self.stats["stored"] += 1
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones until under the size limit."""
+        with self.lock:
+            removed = self.conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age,)
+            ).rowcount
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                victims = []
+                for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+                    if total <= self.max_bytes:
+                        break
+                    victims.append((key,))
+                    total -= size
+                self.conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+                removed += len(victims)
+            self.conn.commit()
+        if removed:
+            logging.info(f"Evicted {removed} cached LLM responses")
+        return removed
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"entries": entries, "mb": size / (1024 * 1024), **self.stats}
+
+    def clear(self) -> None:
+        with self.lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or trim the LLM response cache")
+    parser.add_argument("command", choices=["stats", "evict", "clear"])
+    args = parser.parse_args()
+
+    cache = ResponseCache()
+    try:
+        if args.command == "clear":
+            cache.clear()
+            print("Cleared the LLM response cache")
+        elif args.command == "evict":
+            print(f"Evicted {cache.evict()} entries")
+        summary = cache.summary()
+        print(f"{summary['entries']} cached responses, {summary['mb']:.1f} MB")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+
+import ollama
+
+from llm_cache import ResponseCache, cache_key
+
+DEFAULT_MODEL = "llama3.1:8b"
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class GenerationEngine:
+    """Async front end to Ollama shared by the blog generators.
+
+    At most ``concurrency`` chat requests are in flight at once (match it to
+    the server's OLLAMA_NUM_PARALLEL), and each request is abandoned after
+    ``timeout`` seconds so one stuck generation cannot stall a whole run.
+    Replies are looked up in and saved to ``cache`` unless it is None
+    (set LLM_CACHE=0 to run without one).
+    """
+
+    def __init__(self, model: str = DEFAULT_MODEL, concurrency: Optional[int] = None,
+                 timeout: Optional[float] = None, host: Optional[str] = None,
+                 cache: Optional[ResponseCache] = None):
+        self.model = model
+        self.concurrency = concurrency or int(os.getenv("OLLAMA_CONCURRENCY", os.getenv("OLLAMA_NUM_PARALLEL", 2)))
+        self.timeout = timeout or float(os.getenv("OLLAMA_TIMEOUT", 600))
+        self.client = ollama.AsyncClient(host=host)
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.stats = {"requests": 0, "failures": 0, "timeouts": 0, "seconds": 0.0}
+        if cache is None and os.getenv("LLM_CACHE", "1") != "0":
+            cache = ResponseCache()
+        self.cache = cache
+
+    async def chat(self, messages: List[Dict[str, str]], use_cache: bool = True,
+                   check: Optional[Callable[[str], Any]] = None, **kwargs: Any) -> str:
+        """Send one chat request and return the reply text; raises on error or timeout.
+
+        Identical requests (same model, prompts and options) are answered from
+        the response cache when one is configured and ``use_cache`` is set.
+        A fresh reply is passed to ``check`` first, so one it rejects (by
+        raising) is never cached.
+        """
+        key = None
+        if self.cache is not None and use_cache:
+            key = cache_key(self.model, messages, kwargs)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        async with self.semaphore:
+            started = time.monotonic()
+            self.stats["requests"] += 1
+            try:
+                response = await asyncio.wait_for(
+                    self.client.chat(model=self.model, messages=messages, **kwargs),
+                    timeout=self.timeout,
+                )
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                raise TimeoutError(f"Ollama request timed out after {self.timeout:.0f}s")
+            except Exception:
+                self.stats["failures"] += 1
+                raise
+            finally:
+                self.stats["seconds"] += time.monotonic() - started
+        content = response.message.content
+        if check is not None:
+            try:
+                check(content)
+            except Exception:
+                self.stats["failures"] += 1
+                raise
+        if key is not None:
+            self.cache.put(key, self.model, content)
+        return content
+
+    async def map_ordered(self, func: Callable[[T], Awaitable[R]], items: Iterable[T],
+                          window: Optional[int] = None) -> List[R]:
+        """Run ``func`` over ``items`` concurrently and return the results in input order.
+
+        Items are pulled from the iterable lazily, keeping at most ``window``
+        (default: twice the request concurrency) in progress, so a long
+        stream of articles is never loaded all at once.
+        """
+        window = asyncio.Semaphore(window or self.concurrency * 2)
+
+        async def run(item: T) -> R:
+            try:
+                return await func(item)
+            finally:
+                window.release()
+
+        tasks = []
+        for item in items:
+            await window.acquire()
+            tasks.append(asyncio.create_task(run(item)))
+        return list(await asyncio.gather(*tasks))
+
+    def log_stats(self) -> None:
+        """Log request counts and the average time per request."""
+        requests = self.stats["requests"]
+        average = self.stats["seconds"] / requests if requests else 0.0
+        logging.info(
+            f"LLM requests: {requests} ({self.stats['failures']} failed, {self.stats['timeouts']} timed out), "
+            f"avg {average:.1f}s each, concurrency {self.concurrency}"
+        )
+        if self.cache is not None:
+            cache = self.cache.stats
+            lookups = cache["hits"] + cache["misses"]
+            logging.info(
+                f"LLM cache: {cache['hits']} of {lookups} lookups answered from cache"
+                + (" (bypassed)" if self.cache.bypass else "")
+            )
+
+    def close(self) -> None:
+        """Release the response cache."""
+        if self.cache is not None:
+            self.cache.close()
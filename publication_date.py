@@ -0,0 +1,106 @@
+#publication_date.py
+
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+
+# How old an article may be, by publication date, to be crawled and scraped
+DAYS_TO_CRAWL_BACK = int(os.getenv("DAYS_TO_CRAWL_BACK", 3))
+
+# Where pages declare their publication date, best first. EXTRACT_SCRIPT in
+# src.py checks the same places in the browser.
+PUBLISHED_META_SELECTORS = [
+    'meta[property="article:published_time"]',
+    'meta[itemprop="datePublished"]',
+    'meta[name="publish-date"]',
+    'meta[name="pubdate"]',
+]
+DATE_ONLY = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+# Where published_from_soup found a date. A <time> anywhere on the page may
+# belong to a sidebar or related story, so verdicts based on it are not kept.
+PAGE_TIME = 'page-time'
+
+
+def recent_cutoff(now=None):
+    """Oldest publication time still considered recent"""
+    return (now or datetime.now()) - timedelta(days=DAYS_TO_CRAWL_BACK)
+
+
+def is_stale(value, cutoff):
+    """Whether a declared publication date is before the cutoff.
+
+    A value with no time of day ('2026-10-14') is compared by day, so an
+    article from the cutoff's own day is still recent.
+    """
+    published = parse_date(value)
+    if published is None:
+        return False
+    if DATE_ONLY.fullmatch(value.strip()):
+        return published.date() < cutoff.date()
+    return published < cutoff
+
+
+def parse_date(value):
+    """Parse an ISO 8601 or RFC 2822 date string into a naive local datetime, or None"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            match = DATE_ONLY.search(value)
+            if not match:
+                return None
+            try:
+                parsed = datetime(*map(int, match.groups()))
+            except ValueError:
+                return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def _json_ld_date(node):
+    """First datePublished in a JSON-LD document, searching lists and @graph"""
+    if isinstance(node, list):
+        for item in node:
+            found = _json_ld_date(item)
+            if found:
+                return found
+        return None
+    if not isinstance(node, dict):
+        return None
+    if node.get('datePublished'):
+        return str(node['datePublished'])
+    return _json_ld_date(node.get('@graph'))
+
+
+def published_from_soup(soup):
+    """Publication date string declared by a parsed page, and where it was found, or (None, None).
+
+    Meta tags come first, then JSON-LD, then a <time> inside the article and
+    finally any <time> on the page (PAGE_TIME).
+    """
+    for selector in PUBLISHED_META_SELECTORS:
+        meta = soup.select_one(selector)
+        if meta and meta.get('content'):
+            return meta['content'], 'meta'
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            found = _json_ld_date(json.loads(script.string or ''))
+        except ValueError:
+            continue
+        if found:
+            return found, 'json-ld'
+    time_tag = soup.select_one('article time[datetime]')
+    if time_tag:
+        return time_tag['datetime'], 'article-time'
+    time_tag = soup.select_one('time[datetime]')
+    if time_tag:
+        return time_tag['datetime'], PAGE_TIME
+    return None, None
@@ -0,0 +1,144 @@
+#scrape_log.py
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+
+
+class ScrapeLog:
+    """Append-only JSONL log of scrape attempts.
+
+    Entries are buffered and written in batches, each batch followed by one
+    fsync, so the cost per article stays constant however large the log gets.
+    """
+    def __init__(self, path, batch_size=20, flush_interval=5.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(path, 'a', encoding='utf-8')
+
+    def append(self, entry):
+        """Queue one entry; flushes when the batch is full or old enough"""
+        with self.lock:
+            self.buffer.append(json.dumps(entry, ensure_ascii=False))
+            if (len(self.buffer) >= self.batch_size
+                    or time.monotonic() - self.last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def flush(self):
+        with self.lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self.buffer:
+            self.file.write('\n'.join(self.buffer) + '\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.buffer = []
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        with self.lock:
+            if self.file.closed:
+                return
+            self._flush_locked()
+            self.file.close()
+
+
+def read_entries(path):
+    """Yield the entries of a JSONL log, skipping torn or corrupt lines"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def compact(path):
+    """Rewrite the log keeping only the latest entry per URL"""
+    latest = {}
+    total = 0
+    for entry in read_entries(path):
+        total += 1
+        # Re-inserting moves the URL to the end, so output stays in time order
+        latest.pop(entry.get('url'), None)
+        latest[entry.get('url')] = entry
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for entry in latest.values():
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    print(f"Compacted {path}: {total} entries -> {len(latest)}")
+
+
+def rotate(path, max_bytes=0):
+    """Move the log to a gzipped, timestamped archive and start a new one"""
+    if not os.path.exists(path) or os.path.getsize(path) <= max_bytes:
+        print(f"{path} does not need rotation")
+        return None
+
+    archive_path = f"{path}.{datetime.now().strftime('%Y%m%d_%H%M%S')}.gz"
+    with open(path, 'rb') as src, gzip.open(archive_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    open(path, 'w').close()
+    print(f"Rotated {path} to {archive_path}")
+    return archive_path
+
+
+def stats(path):
+    """Summarise the log by status and extraction method"""
+    by_status = {}
+    by_method = {}
+    durations = []
+    for entry in read_entries(path):
+        status = entry.get('status', 'unknown')
+        by_status[status] = by_status.get(status, 0) + 1
+        if status == 'success':
+            method = entry.get('method') or 'unknown'
+            by_method[method] = by_method.get(method, 0) + 1
+        if entry.get('duration') is not None:
+            durations.append(entry['duration'])
+
+    print(f"Entries by status: {by_status}")
+    print(f"Successes by method: {by_method}")
+    if durations:
+        durations.sort()
+        print(f"Duration: median {durations[len(durations) // 2]:.1f}s, max {durations[-1]:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the scraper's JSONL log")
+    parser.add_argument('command', choices=['compact', 'rotate', 'stats'])
+    parser.add_argument('--path', default=os.path.join("scraped_articles", "scraping_log.jsonl"))
+    parser.add_argument('--max-mb', type=float, default=0,
+                        help="rotate only when the log is larger than this")
+    args = parser.parse_args()
+
+    if args.command == 'compact':
+        compact(args.path)
+    elif args.command == 'rotate':
+        rotate(args.path, int(args.max_mb * 1024 * 1024))
+    else:
+        stats(args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,42 +6,692 @@ import re
 from datetime import datetime
 import os
 from urllib.parse import urlparse
-import json
 from bs4 import BeautifulSoup
 import random
 import csv
 import glob
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import requests
+from requests.adapters import HTTPAdapter
+from url_index import SeenUrlIndex
+from scrape_log import ScrapeLog
+from boilerplate import BoilerplateIndex, line_key
+from strategy_cache import StrategyCache, DEFAULT_STRATEGY_ORDER
+from html_archive import HtmlArchive
+from canonical_url import canonical_url, resolve_canonical
+from article_store import ArticleStore, region_for_folder
+from publication_date import PAGE_TIME, is_stale, parse_date, published_from_soup, recent_cutoff
+from contextlib import asynccontextmanager
+
+try:
+    import psutil
+except ImportError:  # RSS-based recycling is disabled without psutil
+    psutil = None
+
+
+CHROMIUM_PROCESS_NAMES = ('chrome', 'chromium', 'headless_shell')
+
+
+def chromium_rss_mb():
+    """Total resident memory of child Chromium processes in MB, or None if unknown.
+
+    Only browser processes count: the Playwright driver, extraction workers
+    and any other children of this process are skipped.
+    """
+    if psutil is None:
+        return None
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            if not any(name in child.name().lower() for name in CHROMIUM_PROCESS_NAMES):
+                continue
+            total += child.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total / (1024 * 1024)
+
+
+def extraction_pool(workers):
+    """Process pool for HTML extraction.
+
+    Workers are started from a forkserver (spawn where that is unavailable)
+    rather than forked from this process, so they never inherit Playwright's
+    event loop, threads or pipes.
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+
+# Request blocking for browser pages. Only article text is read, so images,
+# media, fonts and ad/analytics traffic are aborted before they download.
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+AD_TRACKER_DOMAINS = {
+    'doubleclick.net', 'googlesyndication.com', 'googleadservices.com',
+    'googletagmanager.com', 'googletagservices.com', 'google-analytics.com',
+    'adservice.google.com', 'amazon-adsystem.com', 'adnxs.com', 'criteo.com',
+    'pubmatic.com', 'rubiconproject.com', 'openx.net', 'moatads.com',
+    'taboola.com', 'outbrain.com', 'scorecardresearch.com', 'chartbeat.com',
+    'chartbeat.net', 'quantserve.com', 'hotjar.com', 'facebook.net',
+    'connect.facebook.net', 'clmbtech.com', 'colombiaonline.com',
+    'izooto.com', 'vdo.ai', 'jwpcdn.com', 'jwplatform.com',
+}
+
+# Per-source overrides, matched against the article host like DOMAIN_CONCURRENCY
+BLOCK_POLICIES = {
+    'default': {
+        'resource_types': BLOCKED_RESOURCE_TYPES,
+        'domains': AD_TRACKER_DOMAINS,
+    },
+}
+
+# Typical transfer sizes used to estimate what a blocked request would have cost
+ESTIMATED_RESOURCE_BYTES = {
+    'image': 60_000,
+    'media': 500_000,
+    'font': 40_000,
+    'script': 40_000,
+    'stylesheet': 20_000,
+    'xhr': 5_000,
+    'fetch': 5_000,
+}
+DEFAULT_RESOURCE_BYTES = 10_000
+
+
+# Readiness detection for browser pages
+CONTENT_SELECTORS = [
+    'article',
+    '.article-content',
+    '.story-content',
+    'div[class*="article"]',
+    '.entry-content',
+    'p'
+]
+
+# Time allowed per domain for content to appear and settle, in ms
+LATENCY_BUDGETS = {
+    'timesofindia': 8000,
+    'hindustantimes': 6000,
+    'ndtv': 6000,
+    'deccanherald': 6000,
+}
+DEFAULT_LATENCY_BUDGET = 8000
+
+STABILITY_INTERVAL_MS = 250
+STABILITY_ROUNDS = 3
+
+# Resolves once the page text length is unchanged for `rounds` polls
+TEXT_STABLE_SCRIPT = """async ({interval, rounds, timeout}) => {
+    const deadline = performance.now() + timeout;
+    let last = -1;
+    let stable = 0;
+    while (performance.now() < deadline) {
+        const length = document.body ? document.body.textContent.length : 0;
+        stable = (length > 0 && length === last) ? stable + 1 : 0;
+        if (stable >= rounds) return true;
+        last = length;
+        await new Promise(resolve => setTimeout(resolve, interval));
+    }
+    return false;
+}"""
+
+
+# In-page extraction. Tries the strategies in the given order (by default the
+# article selector, the class heuristics that used to run in BeautifulSoup
+# over page.content(), then long paragraph collection). Only the winning text
+# and its metadata are returned.
+EXTRACT_SCRIPT = """(order) => {
+    const link = document.querySelector('link[rel=canonical]');
+    const canonical = link ? link.href : null;
+    // Same places as publication_date.published_from_soup, in the same order
+    const published = (() => {
+        const metaSelectors = [
+            'meta[property="article:published_time"]',
+            'meta[itemprop="datePublished"]',
+            'meta[name="publish-date"]',
+            'meta[name="pubdate"]',
+        ];
+        for (const selector of metaSelectors) {
+            const meta = document.querySelector(selector);
+            if (meta && meta.content) return {value: meta.content, source: 'meta'};
+        }
+        const findDate = node => {
+            if (Array.isArray(node)) {
+                for (const item of node) {
+                    const found = findDate(item);
+                    if (found) return found;
+                }
+                return null;
+            }
+            if (!node || typeof node !== 'object') return null;
+            if (node.datePublished) return String(node.datePublished);
+            return findDate(node['@graph']);
+        };
+        for (const script of document.querySelectorAll('script[type="application/ld+json"]')) {
+            try {
+                const found = findDate(JSON.parse(script.textContent));
+                if (found) return {value: found, source: 'json-ld'};
+            } catch (e) {}
+        }
+        const articleTime = document.querySelector('article time[datetime]');
+        if (articleTime) return {value: articleTime.getAttribute('datetime'), source: 'article-time'};
+        const pageTime = document.querySelector('time[datetime]');
+        if (pageTime) return {value: pageTime.getAttribute('datetime'), source: 'page-time'};
+        return {value: null, source: null};
+    })();
+    const strategies = {
+        article: () => {
+            const selector = 'article, .article-content, .story-content';
+            const element = document.querySelector(selector);
+            return element && element.innerText ? {text: element.innerText, selector} : null;
+        },
+        heuristic: () => {
+            const root = document.documentElement.cloneNode(true);
+            root.querySelectorAll('script, style, nav, header, footer, iframe, .ads, .social-share')
+                .forEach(element => element.remove());
+            const byClass = name => Array.from(root.querySelectorAll('[class]'))
+                .find(element => element.getAttribute('class').toLowerCase().includes(name));
+            const candidates = [
+                ['article', () => root.querySelector('article')],
+                ['[class*=article]', () => byClass('article')],
+                ['[class*=story]', () => byClass('story')],
+                ['main', () => root.querySelector('main')],
+            ];
+            for (const [selector, find] of candidates) {
+                const element = find();
+                if (!element) continue;
+                // Same as BeautifulSoup get_text(separator='\\n', strip=True)
+                const walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+                const parts = [];
+                while (walker.nextNode()) {
+                    const text = walker.currentNode.nodeValue.trim();
+                    if (text) parts.push(text);
+                }
+                const text = parts.join('\\n');
+                return text ? {text, selector} : null;
+            }
+            return null;
+        },
+        paragraphs: () => {
+            const text = Array.from(document.getElementsByTagName('p'))
+                .filter(p => p.innerText.length > 50)
+                .map(p => p.innerText)
+                .join('\\n\\n');
+            return text ? {text, selector: 'p'} : null;
+        },
+    };
+    const tried = [];
+    for (const method of order) {
+        tried.push(method);
+        const found = strategies[method]();
+        if (found) return {...found, method, tried, title: document.title, canonical,
+                           published: published.value, published_source: published.source};
+    }
+    return {text: null, method: null, selector: null, tried, title: document.title, canonical,
+            published: published.value, published_source: published.source};
+}"""
+
+
+def latency_budget(domain):
+    """Readiness budget in ms for an article host"""
+    for name, budget in LATENCY_BUDGETS.items():
+        if name in domain:
+            return budget
+    return DEFAULT_LATENCY_BUDGET
+
+
+def block_policy(domain):
+    """Blocking policy for an article host"""
+    for name, policy in BLOCK_POLICIES.items():
+        if name != 'default' and name in domain:
+            return policy
+    return BLOCK_POLICIES['default']
+
+
+class ResourceBlocker:
+    """Aborts unwanted requests on a page and tallies what was saved"""
+    def __init__(self, policy):
+        self.resource_types = set(policy.get('resource_types', ()))
+        self.domains = set(policy.get('domains', ()))
+        self.blocked = {}
+        self.estimated_bytes = 0
+
+    def _blocked_host(self, host):
+        # Check the host and each parent domain, e.g. a.b.doubleclick.net
+        labels = host.split('.')
+        return any('.'.join(labels[i:]) in self.domains for i in range(len(labels) - 1))
+
+    def should_block(self, resource_type, url):
+        if resource_type in self.resource_types:
+            return True
+        host = urlparse(url).hostname
+        return bool(host) and self._blocked_host(host.lower())
+
+    async def handle(self, route):
+        request = route.request
+        resource_type = request.resource_type
+        if self.should_block(resource_type, request.url):
+            self.blocked[resource_type] = self.blocked.get(resource_type, 0) + 1
+            self.estimated_bytes += ESTIMATED_RESOURCE_BYTES.get(resource_type, DEFAULT_RESOURCE_BYTES)
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def install(self, page):
+        await page.route('**/*', self.handle)
+
+    def report(self):
+        return {
+            'blocked': sum(self.blocked.values()),
+            'by_type': dict(self.blocked),
+            'estimated_bytes_saved': self.estimated_bytes,
+        }
+
+
+# Enhanced noise patterns, each with the lowercase literals one of which must
+# occur in the text for the pattern to match. The literals let clean_text
+# skip patterns cheaply before any regex runs.
+NOISE_RULES = [
+    (r'Share\s+(?:on\s+)?(?:Facebook|Twitter|WhatsApp|LinkedIn|Email)', ('share',)),
+    (r'(?:Published|Updated|Posted)\s+(?:On|By|Date):?\s*.*?\d{4}', ('published', 'updated', 'posted')),
+    (r'Listen to Story', ('listen to story',)),
+    (r'Watch Live TV', ('watch live tv',)),
+    (r'Download App', ('download app',)),
+    (r'Follow Us', ('follow us',)),
+    (r'SIGN IN', ('sign in',)),
+    (r'Subscribe', ('subscribe',)),
+    (r'TRENDING TOPICS:.*', ('trending topics:',)),
+    (r'Must Read.*?(?=\n|$)', ('must read',)),
+    (r'Published By:.*?(?=\n|$)', ('published by:',)),
+    (r'In Short.*?(?=\n|$)', ('in short',)),
+    (r'\d+ Views', (' views',)),
+    (r'Advertisement|ADVERTISEMENT', ('advertisement',)),
+    (r'Copyright ©.*?\d{4}', ('copyright ©',)),
+    (r'All rights reserved', ('all rights reserved',)),
+    (r'Read More', ('read more',)),
+    (r'Also Read:.*?(?=\n|$)', ('also read:',)),
+    (r'Click here to.*?(?=\n|$)', ('click here to',)),
+    (r'Follow us on.*?(?=\n|$)', ('follow us on',)),
+]
+NOISE_PATTERNS = [pattern for pattern, _ in NOISE_RULES]
+NOISE_FLAGS = re.IGNORECASE | re.MULTILINE
+NOISE_REGEX = re.compile('|'.join(NOISE_PATTERNS), NOISE_FLAGS)
+
+# Characters that IGNORECASE matches against ASCII letters but str.lower()
+# maps elsewhere (dotless i, long s, and the combining dot left by 'İ').
+# Their presence disables the literal prefilter.
+UNSAFE_FOLDS = ('\u0131', '\u017f', '\u0307')
+
+MULTI_BLANK_LINES = re.compile(r'\n\s*\n\s*\n+')
+# Single spaces are already normalised, so only runs and tabs are rewritten
+HORIZONTAL_SPACE = re.compile(r'[ \t]{2,}|\t')
+WHITESPACE_RUN = re.compile(r'\s+')
+YEAR_LIKE = re.compile(r'\d{4}')
+NAVIGATION_WORDS = ('click', 'subscribe', 'follow', 'download')
+
+
+@lru_cache(maxsize=None)
+def noise_regex_for(indices):
+    """Alternation of the selected noise patterns, in their original order.
+
+    Patterns whose literals are absent cannot match anywhere in the text, so
+    leaving them out of the alternation does not change what sub() removes.
+    """
+    if len(indices) == len(NOISE_RULES):
+        return NOISE_REGEX
+    return re.compile('|'.join(NOISE_PATTERNS[i] for i in indices), NOISE_FLAGS)
+
+
+def remove_noise(content):
+    """Stage 1: strip noise patterns, running only those that can match"""
+    lowered = content.lower()
+    if any(char in lowered for char in UNSAFE_FOLDS):
+        return NOISE_REGEX.sub('', content)
+    
+    indices = tuple(
+        i for i, (_, literals) in enumerate(NOISE_RULES)
+        if any(literal in lowered for literal in literals)
+    )
+    if not indices:
+        return content
+    return noise_regex_for(indices).sub('', content)
+
+
+def clean_article(content, template_keys=frozenset(), collect_keys=True):
+    """Clean article text, returning (cleaned, line_keys).
+
+    line_keys are the fingerprints of every distinct line that survived
+    navigation filtering, including lines dropped as site template, so the
+    boilerplate index keeps counting template lines after it learns them.
+    """
+    if not content:
+        return None, set()
+        
+    # Remove noise patterns
+    content = remove_noise(content)
+    
+    # Clean up whitespace
+    content = MULTI_BLANK_LINES.sub('\n\n', content)
+    content = HORIZONTAL_SPACE.sub(' ', content)
+    
+    # Remove lines that look like navigation elements, duplicate paragraphs
+    # and lines known to be this site's template
+    seen = set()
+    keys = set()
+    unique_lines = []
+    for line in content.split('\n'):
+        line = line.strip()
+        if not (len(line) > 30 or YEAR_LIKE.search(line)
+                and not any(x in line.lower() for x in NAVIGATION_WORDS)):
+            continue
+        normalized = WHITESPACE_RUN.sub(' ', line.lower())
+        if normalized in seen:
+            continue
+        seen.add(normalized)
+        if collect_keys or template_keys:
+            key = line_key(normalized)
+            keys.add(key)
+            if key in template_keys:
+                continue
+        unique_lines.append(line)
+    
+    cleaned = '\n\n'.join(unique_lines).strip()
+    
+    # Only return if we have substantial content
+    return (cleaned if len(cleaned) > 200 else None), keys
+
+
+def clean_text(content, template_keys=frozenset()):
+    """Enhanced content cleaning"""
+    return clean_article(content, template_keys, collect_keys=False)[0]
+
+
+def _article_strategy(soup):
+    selector = 'article, .article-content, .story-content'
+    element = soup.select_one(selector)
+    text = element.get_text(separator='\n', strip=True) if element else None
+    return (text, selector) if text else None
+
+
+def _heuristic_strategy(soup):
+    candidates = [
+        ('article', lambda: soup.find('article')),
+        ('[class*=article]', lambda: soup.find(class_=lambda x: x and 'article' in x.lower())),
+        ('[class*=story]', lambda: soup.find(class_=lambda x: x and 'story' in x.lower())),
+        ('main', lambda: soup.find('main')),
+    ]
+    for selector, find in candidates:
+        element = find()
+        if element:
+            text = element.get_text(separator='\n', strip=True)
+            return (text, selector) if text else None
+    return None
+
+
+def _paragraphs_strategy(soup):
+    paragraphs = [p.get_text().strip() for p in soup.find_all('p')]
+    text = '\n\n'.join(p for p in paragraphs if len(p) > 50)
+    return (text, 'p') if text else None
+
+
+STATIC_STRATEGIES = {
+    'article': _article_strategy,
+    'heuristic': _heuristic_strategy,
+    'paragraphs': _paragraphs_strategy,
+}
+
+
+def extract_article_text(html, order=DEFAULT_STRATEGY_ORDER):
+    """Extract article text from raw HTML with the scraper's BeautifulSoup selectors.
+
+    Returns a dict shaped like EXTRACT_SCRIPT's result: text, method,
+    selector, the strategies tried, and the page's declared canonical URL
+    and publication date.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    link = soup.find('link', rel='canonical', href=True)
+    canonical = link['href'] if link else None
+    # Before the clean-up below removes the JSON-LD scripts
+    published, published_source = published_from_soup(soup)
+    
+    # Remove unwanted elements
+    for elem in soup.select('script, style, nav, header, footer, iframe, .ads, .social-share'):
+        elem.decompose()
+    
+    tried = []
+    for method in order:
+        tried.append(method)
+        found = STATIC_STRATEGIES[method](soup)
+        if found:
+            text, selector = found
+            return {'text': text, 'method': method, 'selector': selector, 'tried': tried,
+                    'canonical': canonical, 'published': published, 'published_source': published_source}
+    return {'text': None, 'method': None, 'selector': None, 'tried': tried,
+            'canonical': canonical, 'published': published, 'published_source': published_source}
+
+
+def extract_and_clean_html(html, template_keys=frozenset(), order=DEFAULT_STRATEGY_ORDER):
+    """Process-pool stage: raw HTML in, extraction result with cleaned content and line keys out"""
+    extracted = extract_article_text(html, order)
+    extracted['content'], extracted['keys'] = clean_article(extracted['text'], template_keys)
+    # The raw text is not needed by the caller; don't ship it back
+    del extracted['text']
+    return extracted
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from short sleeps.
+
+    A healthy loop wakes within a millisecond or two; large values mean
+    synchronous work is stalling every other in-flight page.
+    """
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.samples = []
+        self.task = None
+
+    async def _run(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.monotonic() - expected))
+
+    def start(self):
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    def report(self):
+        """Lag statistics in milliseconds"""
+        if not self.samples:
+            return {'samples': 0, 'mean_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        ordered = sorted(self.samples)
+        return {
+            'samples': len(ordered),
+            'mean_ms': sum(ordered) / len(ordered) * 1000,
+            'p95_ms': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            'max_ms': ordered[-1] * 1000,
+        }
+
+
+class _ContextSlot:
+    """A leasable browser context together with its usage counters"""
+    def __init__(self, browser_index, context):
+        self.browser_index = browser_index
+        self.context = context
+        self.pages_served = 0
+
+
+class BrowserPool:
+    """Long-lived pool of Chromium browsers and contexts that articles lease pages from.
+
+    The pool holds ``browsers`` Chromium instances with ``contexts_per_browser``
+    contexts each. A context is recycled after it has served
+    ``max_pages_per_context`` pages, or when the Chromium processes together
+    exceed ``max_rss_mb`` (requires psutil), so memory stays bounded across
+    long runs.
+    """
+    RSS_CHECK_INTERVAL = 10  # seconds between RSS samples
+
+    def __init__(self, scraper, browsers=2, contexts_per_browser=2, max_pages_per_context=50, max_rss_mb=None):
+        self.scraper = scraper
+        self.num_browsers = browsers
+        self.contexts_per_browser = contexts_per_browser
+        self.max_pages_per_context = max_pages_per_context
+        self.max_rss_mb = max_rss_mb
+        self.browsers = []
+        self.slots = asyncio.Queue()
+        self.recycled = 0
+        self._last_rss_check = 0.0
+        self._over_rss = False
+
+    async def start(self):
+        """Launch all browsers and fill the pool with fresh contexts"""
+        for browser_index in range(self.num_browsers):
+            browser = await self.scraper.launch_browser()
+            self.browsers.append(browser)
+            for _ in range(self.contexts_per_browser):
+                context = await self.scraper.create_context(browser)
+                self.slots.put_nowait(_ContextSlot(browser_index, context))
+        print(f"Browser pool ready: {self.num_browsers} browsers x {self.contexts_per_browser} contexts")
+
+    def _rss_exceeded(self):
+        if not self.max_rss_mb:
+            return False
+        now = time.monotonic()
+        if now - self._last_rss_check >= self.RSS_CHECK_INTERVAL:
+            self._last_rss_check = now
+            rss = chromium_rss_mb()
+            self._over_rss = rss is not None and rss > self.max_rss_mb
+        return self._over_rss
+
+    async def _recycle(self, slot):
+        """Replace the slot's context, relaunching its browser if it has died"""
+        try:
+            await slot.context.close()
+        except Exception:
+            pass
+        browser = self.browsers[slot.browser_index]
+        if not browser.is_connected():
+            browser = await self.scraper.launch_browser()
+            self.browsers[slot.browser_index] = browser
+        slot.context = await self.scraper.create_context(browser)
+        slot.pages_served = 0
+        self.recycled += 1
+        # Recycle at most one context per RSS sample; the next sample comes after
+        # the usual interval, once the freed memory shows up in the totals
+        self._over_rss = False
+
+    @asynccontextmanager
+    async def page(self):
+        """Lease a new page from a pooled context; the page is closed on release"""
+        slot = await self.slots.get()
+        try:
+            if (slot.pages_served >= self.max_pages_per_context
+                    or not self.browsers[slot.browser_index].is_connected()
+                    or self._rss_exceeded()):
+                await self._recycle(slot)
+            page = await slot.context.new_page()
+            slot.pages_served += 1
+            try:
+                yield page
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+        finally:
+            self.slots.put_nowait(slot)
+
+    async def close(self):
+        """Close every pooled context and browser"""
+        while not self.slots.empty():
+            slot = self.slots.get_nowait()
+            try:
+                await slot.context.close()
+            except Exception:
+                pass
+        for browser in self.browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self.browsers = []
+
 
 class NewsScraper:
-    def __init__(self):
+    def __init__(self, seen_urls=None):
         self.output_dir = "scraped_articles"
         os.makedirs(self.output_dir, exist_ok=True)
-        self.log_file = os.path.join(self.output_dir, "scraping_log.json")
+        self.log_file = os.path.join(self.output_dir, "scraping_log.jsonl")
+        self.log = ScrapeLog(self.log_file)
+
+        # Browser pool settings
+        self.playwright = None
+        self.pool = None
+        self.pool_browsers = int(os.getenv("BROWSER_POOL_SIZE", 2))
+        self.pool_contexts_per_browser = int(os.getenv("CONTEXTS_PER_BROWSER", 2))
+        self.max_pages_per_context = int(os.getenv("MAX_PAGES_PER_CONTEXT", 50))
+        self.max_browser_rss_mb = int(os.getenv("MAX_BROWSER_RSS_MB", 2048))
+        if self.max_browser_rss_mb and psutil is None:
+            print(f"Warning: MAX_BROWSER_RSS_MB={self.max_browser_rss_mb} is not enforced without psutil "
+                  "(pip install psutil); browsers are recycled by page count only")
+        self._start_lock = asyncio.Lock()
+        
+        # Static HTTP tier: most article bodies are server-rendered, so a plain
+        # GET is tried first and Playwright is only used as a fallback
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.js_only_domains = {
+            domain.strip().lower()
+            for domain in os.getenv("JS_ONLY_DOMAINS", "").split(',')
+            if domain.strip()
+        }
+        self.tier_stats = {'static': 0, 'browser': 0, 'failed': 0}
+        
+        # Canonical URLs already scraped; a page whose <link rel=canonical>
+        # is in here is the same article under another URL and is not saved
+        self.seen_urls = seen_urls
+        self.canonical_duplicates = 0
+        
+        # Articles published before this (DAYS_TO_CRAWL_BACK) are not saved
+        self.published_cutoff = recent_cutoff()
+        self.stale_articles = 0
+        self.blocking_stats = {'pages': 0, 'blocked': 0, 'estimated_bytes_saved': 0}
+        
+        # HTML parsing and cleaning run in worker processes so they never
+        # block the event loop while other pages are in flight
+        self.extract_workers = int(os.getenv("EXTRACT_WORKERS", os.cpu_count() or 2))
+        self.process_pool = None
+        
+        # Per-site template lines, learned from earlier articles. Each run uses
+        # the snapshot taken the first time a domain is seen.
+        self.boilerplate = BoilerplateIndex()
+        self.template_keys = {}
+        
+        # Which extraction strategy works for each domain
+        self.strategies = StrategyCache()
+        
+        # Scraped articles, read back by the blog generators
+        self.store = ArticleStore()
+        
+        # Optional raw HTML archive for offline re-extraction (reextract.py)
+        self.archive = HtmlArchive() if os.getenv("ARCHIVE_HTML", "0") == "1" else None
         
         # Enhanced noise patterns
-        self.noise_patterns = [
-            r'Share\s+(?:on\s+)?(?:Facebook|Twitter|WhatsApp|LinkedIn|Email)',
-            r'(?:Published|Updated|Posted)\s+(?:On|By|Date):?\s*.*?\d{4}',
-            r'Listen to Story',
-            r'Watch Live TV',
-            r'Download App',
-            r'Follow Us',
-            r'SIGN IN',
-            r'Subscribe',
-            r'TRENDING TOPICS:.*',
-            r'Must Read.*?(?=\n|$)',
-            r'Published By:.*?(?=\n|$)',
-            r'In Short.*?(?=\n|$)',
-            r'\d+ Views',
-            r'Advertisement|ADVERTISEMENT',
-            r'Copyright ©.*?\d{4}',
-            r'All rights reserved',
-            r'Read More',
-            r'Also Read:.*?(?=\n|$)',
-            r'Click here to.*?(?=\n|$)',
-            r'Follow us on.*?(?=\n|$)',
-        ]
-        self.noise_regex = re.compile('|'.join(self.noise_patterns), re.IGNORECASE | re.MULTILINE)
+        self.noise_patterns = NOISE_PATTERNS
+        self.noise_regex = NOISE_REGEX
 
         self.user_agents = [
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -50,9 +700,9 @@ class NewsScraper:
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15"
         ]
 
-    async def setup_browser(self):
-        """Configure browser with anti-detection measures"""
-        browser = await self.playwright.chromium.launch(
+    async def launch_browser(self):
+        """Launch a Chromium instance with anti-detection flags"""
+        return await self.playwright.chromium.launch(
             headless=True,
             args=[
                 '--disable-blink-features=AutomationControlled',
@@ -65,7 +715,9 @@ class NewsScraper:
                 '--window-size=1920,1080',
             ]
         )
-        
+
+    async def create_context(self, browser):
+        """Create a browser context with a random user agent and stealth scripts"""
         context = await browser.new_context(
             user_agent=random.choice(self.user_agents),
             viewport={'width': 1920, 'height': 1080},
@@ -92,46 +744,269 @@ class NewsScraper:
             };
         """)
         
+        return context
+
+    async def setup_browser(self):
+        """Configure browser with anti-detection measures"""
+        browser = await self.launch_browser()
+        context = await self.create_context(browser)
         return browser, context
 
-    async def wait_for_content(self, page):
-        """Enhanced waiting strategy for content"""
+    async def start(self):
+        """Start Playwright and the shared browser pool"""
+        async with self._start_lock:
+            if self.pool is not None:
+                return
+            self.playwright = await async_playwright().start()
+            pool = BrowserPool(
+                self,
+                browsers=self.pool_browsers,
+                contexts_per_browser=self.pool_contexts_per_browser,
+                max_pages_per_context=self.max_pages_per_context,
+                max_rss_mb=self.max_browser_rss_mb,
+            )
+            try:
+                await pool.start()
+            except Exception:
+                # Don't leak the driver or the browsers that did launch; the
+                # next article that needs the browser tier starts over
+                await pool.close()
+                await self.playwright.stop()
+                self.playwright = None
+                raise
+            self.pool = pool
+
+    async def close(self):
+        """Shut down the browser pool and Playwright"""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+        self.session.close()
+        self.log.close()
+        self.boilerplate.save()
+        self.strategies.save()
+        self.store.close()
+        if self.archive is not None:
+            self.archive.close()
+        if self.process_pool is not None:
+            self.process_pool.shutdown()
+            self.process_pool = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def wait_for_content(self, page, budget_ms=DEFAULT_LATENCY_BUDGET):
+        """Wait until article content is present and its text has stopped growing.
+
+        All content selectors are raced as one selector list, then the page
+        text length is polled in-page until it is stable. Both steps share
+        the per-domain latency budget.
+        """
+        started = time.monotonic()
         try:
-            # Wait for initial load
-            await page.wait_for_load_state('domcontentloaded', timeout=30000)
-            
-            # Try multiple content indicators
-            content_selectors = [
-                'article',
-                '.article-content',
-                '.story-content',
-                'div[class*="article"]',
-                '.entry-content',
-                'p'
-            ]
-            
-            # Wait for any of the selectors to appear
-            for selector in content_selectors:
-                try:
-                    await page.wait_for_selector(selector, timeout=5000)
-                    return True
-                except:
-                    continue
-                    
+            await page.wait_for_selector(', '.join(CONTENT_SELECTORS), timeout=budget_ms)
+        except Exception:
             return False
-            
+        
+        try:
+            # Trigger lazy-loaded sections before measuring stability
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            remaining_ms = budget_ms - (time.monotonic() - started) * 1000
+            if remaining_ms > 0:
+                await page.evaluate(TEXT_STABLE_SCRIPT, {
+                    'interval': STABILITY_INTERVAL_MS,
+                    'rounds': STABILITY_ROUNDS,
+                    'timeout': remaining_ms,
+                })
         except Exception as e:
             print(f"Wait error (non-critical): {e}")
-            return False
+        return True
 
-    async def scrape_article(self, url, title, source, timestamp, output_dir):
-        self.playwright = await async_playwright().start()
+    async def run_cpu(self, func, *args):
+        """Run a CPU-bound function in the extraction process pool"""
+        if self.process_pool is None:
+            self.process_pool = extraction_pool(self.extract_workers)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.process_pool, func, *args)
+
+    async def archive_page(self, url, html, meta):
+        """Store fetched HTML in the archive, if enabled, without blocking the loop"""
+        if self.archive is None or not html:
+            return
         try:
-            browser, context = await self.setup_browser()
-            page = await context.new_page()
-            
+            await asyncio.to_thread(self.archive.store, url, html, **meta)
+        except Exception as e:
+            print(f"Error archiving {url}: {e}")
+
+    def templates_for(self, domain):
+        """Template line fingerprints for a domain, fixed for the run"""
+        if domain not in self.template_keys:
+            self.template_keys[domain] = self.boilerplate.template_lines(domain)
+        return self.template_keys[domain]
+
+    def is_js_only(self, url):
+        """Whether the url's domain always needs a browser to render its articles"""
+        domain = urlparse(url).netloc.lower()
+        return any(domain == js_domain or domain.endswith('.' + js_domain) for js_domain in self.js_only_domains)
+
+    async def fetch_static(self, url, template_keys=frozenset(), order=DEFAULT_STRATEGY_ORDER, meta=None):
+        """Fetch the page with a plain HTTP GET and extract it.
+
+        Returns extract_and_clean_html's result, or None if the fetch failed.
+        """
+        try:
+            response = await asyncio.to_thread(
+                self.session.get,
+                url,
+                headers={
+                    'User-Agent': random.choice(self.user_agents),
+                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                    'Accept-Language': 'en-US,en;q=0.5',
+                },
+                timeout=15,
+            )
+        except requests.RequestException as e:
+            print(f"Static fetch failed for {url}: {e}")
+            return None
+        
+        if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', 'text/html'):
+            return None
+        
+        await self.archive_page(url, response.text, meta or {})
+        return await self.run_cpu(extract_and_clean_html, response.text, template_keys, order)
+
+    def tier_report(self):
+        """Hit counts and rates of each fetch tier"""
+        total = sum(self.tier_stats.values())
+        return {
+            tier: {'count': count, 'rate': count / total if total else 0.0}
+            for tier, count in self.tier_stats.items()
+        }
+
+    async def scrape_article(self, url, title, source, timestamp, output_dir):
+        """Scrape an article, trying a static HTTP fetch before the browser"""
+        started = time.monotonic()
+        domain = urlparse(url).netloc.lower()
+        template_keys = self.templates_for(domain)
+        order = self.strategies.order(domain)
+        content, keys, method, selector, declared_canonical, declared_published = None, set(), None, None, None, None
+        published_source, error = None, None
+        meta = {'title': title, 'source': source, 'timestamp': timestamp, 'output_dir': output_dir}
+        
+        if not self.is_js_only(url):
+            extracted = await self.fetch_static(url, template_keys, order, meta)
+            if extracted:
+                content, keys = extracted['content'], extracted['keys']
+                method, selector = extracted['method'], extracted['selector']
+                declared_canonical, declared_published = extracted['canonical'], extracted['published']
+                published_source = extracted['published_source']
+                self.strategies.record(domain, extracted['tried'], method if content else None, selector)
+                if content:
+                    print(f"\nStatic fetch succeeded: {url} ({method})")
+        
+        if content:
+            tier = 'static'
+        else:
+            # Launching the pool, leasing a page or installing the blocker can
+            # fail too; the article must still be logged as a failure
+            try:
+                extracted = await self.scrape_with_browser(url, order, meta)
+                if extracted:
+                    method, selector = extracted['method'], extracted['selector']
+                    declared_canonical, declared_published = extracted.get('canonical'), extracted.get('published')
+                    published_source = extracted.get('published_source')
+                    if extracted['text']:
+                        content, keys = await self.run_cpu(clean_article, extracted['text'], template_keys)
+                    self.strategies.record(domain, extracted['tried'], method if content else None, selector)
+            except Exception as e:
+                print(f"Browser scrape failed for {url}: {e}")
+                error = str(e)
+            if not content:
+                print("No valid content could be extracted")
+            tier = 'browser' if content else 'failed'
+        self.tier_stats[tier] += 1
+        
+        if content:
+            article_url, published, status = self.vet_article(url, declared_canonical, declared_published,
+                                                               published_source)
+        else:
+            article_url, published, status = resolve_canonical(declared_canonical, url), parse_date(declared_published), "failed"
+        article_id = None
+        if status == "success":
+            article_id = self.save_content(article_url, content, title, source, timestamp, output_dir, published)
+        if article_id:
+            self.boilerplate.add_article(domain, keys)
+            if self.seen_urls is not None:
+                self.seen_urls.add(article_url)
+        elif status == "success":
+            status = "failed"
+        self._update_log({
+            "title": title,
+            "url": article_url,
+            "fetched_url": url,
+            "source": source,
+            "article_id": article_id,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "status": status,
+            "published": published.strftime("%Y-%m-%d %H:%M:%S") if published else None,
+            "tier": tier,
+            "method": method,
+            "selector": selector,
+            "duration": round(time.monotonic() - started, 2),
+            "error": error,
+        })
+        return article_id
+
+    def vet_article(self, url, declared_canonical, declared_published, published_source=None):
+        """Decide whether extracted content from url is a new, recent article.
+
+        Returns (article_url, published, status): the canonical URL to save
+        it under, its publication date, and "success", "duplicate" (the
+        canonical URL was already scraped under another URL) or "stale"
+        (published before the cutoff). Rejected urls are added to seen_urls
+        in canonical form, except stale ones dated only by a <time> outside
+        the article, which may not be the article's own date.
+        """
+        article_url = resolve_canonical(declared_canonical, url)
+        key = canonical_url(url)
+        published = parse_date(declared_published)
+        if self.seen_urls is not None and article_url != key and article_url in self.seen_urls:
+            print(f"Already scraped as {article_url}: {url}")
+            self.canonical_duplicates += 1
+            self.seen_urls.add(key)
+            return article_url, published, "duplicate"
+        if is_stale(declared_published, self.published_cutoff):
+            # Old news: never worth an LLM call, and it won't become recent
+            print(f"Skipping stale article published {published:%Y-%m-%d}: {url}")
+            self.stale_articles += 1
+            if self.seen_urls is not None and published_source != PAGE_TIME:
+                self.seen_urls.add(key)
+            return article_url, published, "stale"
+        return article_url, published, "success"
+
+    async def scrape_with_browser(self, url, order=DEFAULT_STRATEGY_ORDER, meta=None):
+        """Render the article in a pooled Playwright page and extract it.
+
+        Returns EXTRACT_SCRIPT's result, or None if the page failed to load.
+        Failures to start the pool or lease a page are raised.
+        """
+        if self.pool is None:
+            await self.start()
+
+        async with self.pool.page() as page:
             print(f"\nScraping: {url}")
             
+            # The pool is shared across sources, so blocking is set per page
+            blocker = ResourceBlocker(block_policy(urlparse(url).netloc.lower()))
+            await blocker.install(page)
+            
             # Enhanced page loading strategy
             try:
                 # Initial navigation with longer timeout
@@ -145,195 +1020,79 @@ class NewsScraper:
                     print(f"Failed to load page: {response.status}")
                     return None
                 
-                # Wait for content to be available
-                content_found = await self.wait_for_content(page)
+                # Wait for content to appear and settle within the domain's budget
+                content_found = await self.wait_for_content(page, latency_budget(urlparse(url).netloc.lower()))
                 if not content_found:
                     print("Warning: Content indicators not found, but continuing...")
                 
-                # Add random delay to mimic human behavior
-                await page.wait_for_timeout(random.randint(2000, 4000))
-                
-                # Scroll smoothly
-                await page.evaluate("""
-                    window.scrollTo({
-                        top: document.body.scrollHeight,
-                        behavior: 'smooth'
-                    });
-                """)
-                await page.wait_for_timeout(1000)
-                
-                # Try multiple extraction methods
-                content = None
-                
-                # Method 1: Direct HTML method
-                try:
-                    content = await page.evaluate("""() => {
-                        const article = document.querySelector('article, .article-content, .story-content');
-                        return article ? article.innerText : null;
-                    }""")
-                except:
-                    pass
-                
-                # Method 2: BeautifulSoup fallback
-                if not content:
-                    html = await page.content()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Remove unwanted elements
-                    for elem in soup.select('script, style, nav, header, footer, iframe, .ads, .social-share'):
-                        elem.decompose()
-                    
-                    # Try multiple selectors
-                    article = (
-                        soup.find('article') or 
-                        soup.find(class_=lambda x: x and 'article' in x.lower()) or
-                        soup.find(class_=lambda x: x and 'story' in x.lower()) or
-                        soup.find('main')
-                    )
-                    
-                    if article:
-                        content = article.get_text(separator='\n', strip=True)
-                
-                # Method 3: Paragraph collection
-                if not content:
-                    paragraphs = await page.evaluate("""() => {
-                        return Array.from(document.getElementsByTagName('p'))
-                            .filter(p => p.innerText.length > 50)
-                            .map(p => p.innerText)
-                            .join('\\n\\n');
-                    }""")
-                    if paragraphs:
-                        content = paragraphs
-                
-                if content:
-                    cleaned_content = self.clean_content(content)
-                    if cleaned_content:
-                        print("\nContent found! Saving...")
-                        return self.save_content(url, cleaned_content, title, source, timestamp, output_dir)
-                
-                print("No valid content could be extracted")
-                return None
+                # Run the extraction strategies in the page in one round trip,
+                # starting with the one that has worked best for this domain
+                extracted = await page.evaluate(EXTRACT_SCRIPT, list(order))
+                if self.archive is not None:
+                    await self.archive_page(url, await page.content(), meta or {})
+                if extracted['text']:
+                    print(f"Extracted {len(extracted['text'])} chars via {extracted['method']} ({extracted['selector']})")
+                return extracted
                 
             except Exception as e:
                 print(f"Scraping error: {e}")
                 return None
-                
-        finally:
-            await context.close()
-            await browser.close()
-            await self.playwright.stop()
+            finally:
+                self._record_blocking(url, blocker.report())
+
+    def _record_blocking(self, url, page_report):
+        """Add one page's blocked-request tally to the run totals"""
+        self.blocking_stats['pages'] += 1
+        self.blocking_stats['blocked'] += page_report['blocked']
+        self.blocking_stats['estimated_bytes_saved'] += page_report['estimated_bytes_saved']
+        if page_report['blocked']:
+            print(f"Blocked {page_report['blocked']} requests on {url} "
+                  f"(~{page_report['estimated_bytes_saved'] / 1024:.0f} KB saved)")
 
     def clean_content(self, content):
         """Enhanced content cleaning"""
-        if not content:
-            return None
-            
-        # Remove noise patterns
-        content = self.noise_regex.sub('', content)
-        
-        # Clean up whitespace
-        content = re.sub(r'\n\s*\n\s*\n+', '\n\n', content)
-        content = re.sub(r'[ \t]+', ' ', content)
-        
-        # Remove lines that look like navigation elements
-        lines = [line.strip() for line in content.split('\n')]
-        lines = [
-            line for line in lines 
-            if len(line) > 30 or re.search(r'\d{4}', line)
-            and not any(x in line.lower() for x in ['click', 'subscribe', 'follow', 'download'])
-        ]
-        
-        # Remove duplicate paragraphs
-        seen = set()
-        unique_lines = []
-        for line in lines:
-            normalized = re.sub(r'\s+', ' ', line.lower())
-            if normalized not in seen:
-                seen.add(normalized)
-                unique_lines.append(line)
-        
-        cleaned = '\n\n'.join(unique_lines).strip()
-        
-        # Only return if we have substantial content
-        return cleaned if len(cleaned) > 200 else None
-
-    def generate_filename(self, title):
-        """Generate a filename based on title and timestamp"""
-        # Create a safe filename from the title by replacing disallowed characters
-        safe_title = "".join(c if c.isalnum() or c in " _-" else "_" for c in title)
-        safe_title = safe_title[:50].strip()  # Limit title length
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return f"{safe_title}_{timestamp}.txt"
-
-    def save_content(self, url, content, title, source, timestamp, output_dir):
-        """Save content to file and update log"""
+        return clean_text(content)
+
+    def save_content(self, url, content, title, source, timestamp, output_dir, published=None):
+        """Save content to the article store under the output folder's region; returns the article id"""
         try:
-            filename = self.generate_filename(title)
-            filepath = os.path.join(output_dir, filename)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"Title: {title}\n")
-                f.write(f"URL: {url}\n")
-                f.write(f"Source: {source}\n")
-                f.write(f"Original Timestamp: {timestamp}\n")
-                f.write(f"Scraped Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("-" * 80 + "\n\n")
-                f.write(content)
-            
-            log_entry = {
-                "title": title,
-                "url": url,
-                "source": source,
-                "filename": filename,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "status": "success"
-            }
-            
-            self._update_log(log_entry)
-            
-            print(f"\nContent saved to: {filepath}")
-            return filepath
+            region = region_for_folder(output_dir)
+            article_id = self.store.add(url, title, source, region, timestamp, content, published)
+            print(f"\nContent saved as {region} article {article_id}: {title}")
+            return article_id
             
         except Exception as e:
             print(f"Error saving content: {e}")
             return None
 
     def _update_log(self, log_entry):
-        """Update the log file with new entry"""
+        """Append an entry to the scrape log"""
         try:
-            log_data = []
-            if os.path.exists(self.log_file):
-                with open(self.log_file, 'r') as f:
-                    try:
-                        log_data = json.load(f)
-                    except json.JSONDecodeError:
-                        pass
-            
-            log_data.append(log_entry)
-            
-            with open(self.log_file, 'w') as f:
-                json.dump(log_data, f, indent=2)
-                
+            self.log.append(log_entry)
         except Exception as e:
             print(f"Error updating log: {e}")
 
-async def process_csv_files(folder, output_folder):
-    """Process all CSV files in the specified folder"""
-    print(f"\nProcessing CSV files from {folder} folder")
-    
-    # Create output folder if it doesn't exist
-    os.makedirs(output_folder, exist_ok=True)
-    
-    # Find all CSV files in the folder
-    csv_files = glob.glob(os.path.join(folder, "*.csv"))
-    
-    if not csv_files:
-        print(f"No CSV files found in {folder} folder")
-        return
-    
-    scraper = NewsScraper()
-    
-    # Process each CSV file
+# Per-domain concurrency limits, matched against the article host
+DOMAIN_CONCURRENCY = {
+    'timesofindia': 3,
+    'hindustantimes': 2,
+    'ndtv': 2,
+    'deccanherald': 2,
+}
+DEFAULT_DOMAIN_CONCURRENCY = 2
+
+
+def domain_limit(domain):
+    """Look up the concurrency limit for a host"""
+    for name, limit in DOMAIN_CONCURRENCY.items():
+        if name in domain:
+            return limit
+    return DEFAULT_DOMAIN_CONCURRENCY
+
+
+def read_csv_articles(csv_files):
+    """Read (title, url, source, timestamp) rows from the crawler's CSV files"""
+    articles = []
     for csv_file in csv_files:
         print(f"\nProcessing CSV file: {csv_file}")
         
@@ -350,13 +1109,8 @@ async def process_csv_files(folder, output_folder):
                         source = row[2].strip()
                         timestamp = row[3].strip()
                         
-                        print(f"\nProcessing article: {title}")
-                        
                         if url:
-                            # Scrape the article
-                            result = await scraper.scrape_article(url, title, source, timestamp, output_folder)
-                            if not result:
-                                print(f"Scraping failed for URL: {url}")
+                            articles.append((title, url, source, timestamp))
                         else:
                             print(f"Missing URL for article: {title}")
                     else:
@@ -364,6 +1118,132 @@ async def process_csv_files(folder, output_folder):
                         
         except Exception as e:
             print(f"Error processing CSV file {csv_file}: {e}")
+    return articles
+
+
+def print_scrape_report(report):
+    """Print the aggregated result of a scraping run"""
+    print("\n===== SCRAPING REPORT =====")
+    print(f"Articles: {report['total']}, succeeded: {report['succeeded']}, "
+          f"failed: {report['failed']}, already scraped: {report['skipped']}, "
+          f"same article under another URL: {report['duplicates']}, "
+          f"published too long ago: {report['stale']}")
+    print(f"Elapsed: {report['elapsed']:.1f}s")
+    for domain, stats in sorted(report['domains'].items()):
+        print(f"  {domain}: {stats['succeeded']} ok, {stats['failed']} failed, "
+              f"avg {stats['avg_seconds']:.1f}s/article")
+    for tier, stats in report['tiers'].items():
+        print(f"  {tier} tier: {stats['count']} ({stats['rate']:.0%})")
+    blocking = report['blocking']
+    if blocking['pages']:
+        print(f"  Browser requests blocked: {blocking['blocked']} on {blocking['pages']} pages "
+              f"(~{blocking['estimated_bytes_saved'] / (1024 * 1024):.1f} MB saved)")
+    lag = report['loop_lag']
+    print(f"  Event loop lag: mean {lag['mean_ms']:.1f}ms, p95 {lag['p95_ms']:.1f}ms, max {lag['max_ms']:.1f}ms")
+    print("===========================")
+
+
+async def process_csv_files(folder, output_folder, max_concurrency=None):
+    """Process all CSV files in the specified folder.
+
+    Articles are scraped concurrently, bounded by a global limit and by a
+    per-domain limit from DOMAIN_CONCURRENCY, and saved to the article store
+    under output_folder's region. Returns an aggregated report.
+    """
+    print(f"\nProcessing CSV files from {folder} folder")
+    
+    # Find all CSV files in the folder
+    csv_files = glob.glob(os.path.join(folder, "*.csv"))
+    
+    if not csv_files:
+        print(f"No CSV files found in {folder} folder")
+        return None
+    
+    # Skip articles scraped in earlier runs (and repeats within this run)
+    seen_urls = SeenUrlIndex()
+    articles = []
+    queued = set()
+    skipped = 0
+    for title, url, source, timestamp in read_csv_articles(csv_files):
+        # The canonical form is only the dedup key; the URL as listed is what gets fetched
+        key = canonical_url(url)
+        if key in seen_urls or key in queued:
+            skipped += 1
+            continue
+        queued.add(key)
+        articles.append((title, url, source, timestamp))
+    if skipped:
+        print(f"Skipping {skipped} articles that were already scraped or listed twice")
+    
+    scraper = NewsScraper(seen_urls)
+    if max_concurrency is None:
+        max_concurrency = int(os.getenv(
+            "MAX_CONCURRENT_SCRAPES",
+            scraper.pool_browsers * scraper.pool_contexts_per_browser,
+        ))
+    
+    global_limit = asyncio.Semaphore(max_concurrency)
+    domain_limits = {}
+    domains = {}
+    started = time.monotonic()
+    
+    async def scrape_one(title, url, source, timestamp):
+        domain = urlparse(url).netloc.lower()
+        if domain not in domain_limits:
+            domain_limits[domain] = asyncio.Semaphore(domain_limit(domain))
+            domains[domain] = {'succeeded': 0, 'failed': 0, 'seconds': 0.0}
+        stats = domains[domain]
+        
+        # Take the domain slot first so a slow domain queues on its own
+        # semaphore instead of holding global slots other domains could use
+        async with domain_limits[domain]:
+            async with global_limit:
+                print(f"\nProcessing article: {title}")
+                article_started = time.monotonic()
+                try:
+                    result = await scraper.scrape_article(url, title, source, timestamp, output_folder)
+                except Exception as e:
+                    print(f"Scraping error for {url}: {e}")
+                    result = None
+                stats['seconds'] += time.monotonic() - article_started
+        
+        if result:
+            stats['succeeded'] += 1
+            seen_urls.add(url)
+        else:
+            stats['failed'] += 1
+            print(f"Scraping failed for URL: {url}")
+        return result
+    
+    lag_monitor = LoopLagMonitor()
+    lag_monitor.start()
+    try:
+        results = await asyncio.gather(*(scrape_one(*article) for article in articles))
+    finally:
+        await lag_monitor.stop()
+        await scraper.close()
+        seen_urls.close()
+    
+    for stats in domains.values():
+        attempts = stats['succeeded'] + stats['failed']
+        stats['avg_seconds'] = stats.pop('seconds') / attempts if attempts else 0.0
+    
+    report = {
+        'total': len(articles),
+        'succeeded': sum(1 for result in results if result),
+        'failed': sum(1 for result in results if not result) - scraper.canonical_duplicates - scraper.stale_articles,
+        'skipped': skipped,
+        'duplicates': scraper.canonical_duplicates,
+        'stale': scraper.stale_articles,
+        'elapsed': time.monotonic() - started,
+        'domains': domains,
+        'tiers': scraper.tier_report(),
+        'blocking': scraper.blocking_stats,
+        'loop_lag': lag_monitor.report(),
+        'articles': [result for result in results if result],
+    }
+    print_scrape_report(report)
+    return report
 
 async def main():
     # Process both local and national folders
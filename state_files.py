@@ -0,0 +1,32 @@
+#state_files.py
+
+import json
+import os
+
+
+def default_data_path(filename):
+    """Path of a state file inside DATA_DIRECTORY"""
+    data_dir = os.getenv("DATA_DIRECTORY", "./data")
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, filename)
+
+
+def load_json_state(path, description):
+    """Contents of a JSON state file; an empty dict if it is missing or unreadable"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Ignoring unreadable {description} {path}: {e}")
+        return {}
+
+
+def save_json_state(path, data, indent=None):
+    """Replace a JSON state file atomically, so a crash never leaves it half-written"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp_path, path)
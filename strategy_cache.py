@@ -0,0 +1,80 @@
+#strategy_cache.py
+
+import threading
+
+from state_files import default_data_path, load_json_state, save_json_state
+
+# Extraction strategies shared by the static and browser tiers, in the order
+# they are tried for a domain with no history
+DEFAULT_STRATEGY_ORDER = ['article', 'heuristic', 'paragraphs']
+
+
+class StrategyCache:
+    """Persisted per-domain record of which extraction strategy works.
+
+    Each domain keeps attempt/success counts per strategy and the selector
+    that last succeeded. Pages from a domain try its best strategy first and
+    fall back to the others, in default order, only when it fails. Every
+    ``REPROBE_EVERY`` lookups a domain gets the default order instead, so a
+    strategy that lost out once can win its rate back.
+    """
+    MIN_ATTEMPTS = 3
+    REPROBE_EVERY = 20
+
+    def __init__(self, path=None):
+        self.path = path or default_data_path("strategies.json")
+        self.lock = threading.Lock()
+        self.domains = load_json_state(self.path, "strategy cache")
+        self.lookups = {}
+        self.dirty = False
+
+    def success_rate(self, stats):
+        return stats['successes'] / stats['attempts'] if stats['attempts'] else 0.0
+
+    def order(self, domain):
+        """Strategies to try for a domain, best first"""
+        strategies = self.domains.get(domain)
+        if not strategies:
+            return list(DEFAULT_STRATEGY_ORDER)
+        with self.lock:
+            self.lookups[domain] = self.lookups.get(domain, 0) + 1
+            if self.lookups[domain] % self.REPROBE_EVERY == 0:
+                return list(DEFAULT_STRATEGY_ORDER)
+        # Equal rates fall back to the default order rather than the method name
+        proven = [
+            (self.success_rate(stats), -DEFAULT_STRATEGY_ORDER.index(method), method)
+            for method, stats in strategies.items()
+            if method in DEFAULT_STRATEGY_ORDER
+            and stats['attempts'] >= self.MIN_ATTEMPTS and stats['successes']
+        ]
+        if not proven:
+            return list(DEFAULT_STRATEGY_ORDER)
+        best = max(proven)[2]
+        return [best] + [method for method in DEFAULT_STRATEGY_ORDER if method != best]
+
+    def record(self, domain, tried, winner=None, selector=None):
+        """Record one extraction: every strategy tried, and which one produced the saved article"""
+        with self.lock:
+            strategies = self.domains.setdefault(domain, {})
+            for method in tried:
+                stats = strategies.setdefault(method, {'attempts': 0, 'successes': 0, 'selector': None})
+                stats['attempts'] += 1
+                if method == winner:
+                    stats['successes'] += 1
+                    stats['selector'] = selector
+            self.dirty = True
+
+    def report(self):
+        """Per-domain success rates, for logging"""
+        return {
+            domain: {method: round(self.success_rate(stats), 2) for method, stats in strategies.items()}
+            for domain, strategies in self.domains.items()
+        }
+
+    def save(self):
+        """Write the cache to disk if it changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            save_json_state(self.path, self.domains, indent=2)
+            self.dirty = False
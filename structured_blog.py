@@ -0,0 +1,96 @@
+import json
+from typing import Any, Dict, Optional
+
+from llm_engine import GenerationEngine
+
+# Fields of a generated blog, in reading order after the topic
+BLOG_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "topic": {"type": "string"},
+        "title": {"type": "string"},
+        "meta_description": {"type": "string"},
+        "introduction": {"type": "string"},
+        "key_points": {"type": "array", "items": {"type": "string"}},
+        "analysis": {"type": "string"},
+        "conclusion": {"type": "string"},
+    },
+    "required": ["topic", "title", "meta_description", "introduction", "key_points", "analysis", "conclusion"],
+}
+
+# Section labels used when a blog is written out as plain text
+ENGLISH_HEADINGS = {
+    "title": "Title",
+    "introduction": "Introduction",
+    "key_points": "Key Points",
+    "analysis": "Analysis",
+    "conclusion": "Conclusion",
+}
+
+HINDI_HEADINGS = {
+    "title": "शीर्षक",
+    "introduction": "परिचय",
+    "key_points": "मुख्य बिंदु",
+    "analysis": "विश्लेषण",
+    "conclusion": "निष्कर्ष",
+}
+
+HEADINGS = {"english": ENGLISH_HEADINGS, "hindi": HINDI_HEADINGS}
+
+STRUCTURED_SYSTEM_PROMPT = """\
+You are an expert content analyst and writer who turns raw news articles into clear, engaging, SEO-optimized blog posts.
+
+Read the article, work out its main topic, and write the blog in one pass as a JSON object with these fields:
+- topic: the main topic or theme of the article, in a few words
+- title: a clear, engaging title under 60 characters with the primary SEO keywords
+- meta_description: 150-160 characters summarizing the post with keywords
+- introduction: a brief context-setting opening that works the keywords in naturally
+- key_points: the main takeaways, one short sentence each
+- analysis: insights and implications, in short paragraphs
+- conclusion: final thoughts with a call-to-action for readers
+
+Write in a clear, professional, factual tone with active voice and no jargon. Keep keyword density around 1-2% without stuffing.
+Use plain text in every field: no markdown symbols. Keep the whole post within {max_words} words."""
+
+
+def parse_structured_blog(reply: str) -> Dict[str, Any]:
+    """Blog fields from a model reply; raises ValueError if the reply is not a usable blog."""
+    blog = json.loads(reply)
+    if not isinstance(blog, dict):
+        raise ValueError("Structured blog reply is not a JSON object")
+    missing = [name for name in ("title", "introduction") if not str(blog.get(name) or "").strip()]
+    if missing:
+        raise ValueError(f"Structured blog reply is missing {', '.join(missing)}")
+
+    parsed = {name: str(blog.get(name) or "").strip() for name in BLOG_SCHEMA["properties"] if name != "key_points"}
+    points = blog.get("key_points") or []
+    if isinstance(points, str):
+        points = points.splitlines()
+    parsed["key_points"] = [str(point).strip() for point in points if str(point).strip()]
+    return parsed
+
+
+async def generate_structured_blog(file_content: str, engine: GenerationEngine,
+                                   max_words: int = 300) -> Dict[str, Any]:
+    """Topic and full blog for an article in a single schema-constrained request."""
+    reply = await engine.chat(
+        messages=[
+            {"role": "system", "content": STRUCTURED_SYSTEM_PROMPT.format(max_words=max_words)},
+            {"role": "user", "content": file_content},
+        ],
+        format=BLOG_SCHEMA,
+        check=parse_structured_blog,
+    )
+    return parse_structured_blog(reply)
+
+
+def blog_to_text(blog: Dict[str, Any], headings: Optional[Dict[str, str]] = None) -> str:
+    """Plain-text form of a structured blog, laid out like the two-pass generators' output."""
+    headings = headings or ENGLISH_HEADINGS
+    parts = [f"{headings['title']}: {blog['title']}", f"{headings['introduction']}: {blog['introduction']}"]
+    if blog["key_points"]:
+        parts.append(f"{headings['key_points']}:\n" + "\n".join(f"- {point}" for point in blog["key_points"]))
+    for name in ("analysis", "conclusion"):
+        if blog[name]:
+            parts.append(f"{headings[name]}: {blog[name]}")
+    return "\n\n".join(parts)
@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import logging
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+from llm_cache import text_digest
+from llm_engine import GenerationEngine
+from state_files import default_data_path
+
+SEGMENT_SYSTEM_PROMPT = (
+    "You are a highly accurate translation model. "
+    "Translate the following English text into {language}, ensuring the tone, context, and meaning are preserved. "
+    "Reply with the translation only."
+)
+
+BULLET = re.compile(r'^[-*•]\s*')
+
+
+def normalise(text: str) -> str:
+    """Form of a segment that ignores case, spacing, bullets and surrounding punctuation."""
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = BULLET.sub("", text.strip())
+    text = " ".join(text.split())
+    return text.strip(" .,:;!?\"'()[]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+class TranslationMemory:
+    """Persistent memory of translated segments.
+
+    A segment is looked up by its exact text first, then by its normalised
+    form, so recurring headings, key points and call-to-action lines are
+    translated once and reused across blogs.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_data_path("translation_memory.db")
+        self.stats = {"exact": 0, "normalised": 0, "misses": 0, "tokens_saved": 0}
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS segments (
+                language TEXT NOT NULL,
+                source_key TEXT NOT NULL,
+                normal_key TEXT NOT NULL,
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (language, source_key)
+            );
+            CREATE INDEX IF NOT EXISTS segments_normal ON segments (language, normal_key);
+        """)
+        self.conn.commit()
+
+    def lookup(self, source: str, language: str) -> Optional[str]:
+        """Stored translation of a segment, or None."""
+        with self.lock:
+            match = "exact"
+            row = self.conn.execute(
+                "SELECT source_key, target FROM segments WHERE language = ? AND source_key = ?",
+                (language, text_digest(source))
+            ).fetchone()
+            if row is None:
+                match = "normalised"
+                row = self.conn.execute(
+                    "SELECT source_key, target FROM segments WHERE language = ? AND normal_key = ? "
+                    "ORDER BY hits DESC LIMIT 1",
+                    (language, text_digest(normalise(source)))
+                ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE segments SET hits = hits + 1 WHERE language = ? AND source_key = ?", (language, row[0])
+                )
+                self.conn.commit()
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats[match] += 1
+        self.stats["tokens_saved"] += estimate_tokens(source) + estimate_tokens(row[1])
+        return row[1]
+
+    def add(self, source: str, target: str, language: str) -> None:
+        """Remember a segment's translation."""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO segments (language, source_key, normal_key, source, target, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (language, text_digest(source), text_digest(normalise(source)), source, target, time.time())
+            )
+            self.conn.commit()
+
+    def log_stats(self) -> None:
+        """Log the hit ratio and the estimated tokens not sent to the model."""
+        hits = self.stats["exact"] + self.stats["normalised"]
+        lookups = hits + self.stats["misses"]
+        ratio = hits / lookups if lookups else 0.0
+        logging.info(
+            f"Translation memory: {hits} of {lookups} segments reused ({ratio:.0%}; "
+            f"{self.stats['exact']} exact, {self.stats['normalised']} normalised), "
+            f"~{self.stats['tokens_saved']} tokens saved"
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        with self.lock:
+            return dict(self.conn.execute(
+                "SELECT language, COUNT(*) FROM segments GROUP BY language ORDER BY language"
+            ).fetchall())
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+async def translate_segments(segments: List[str], engine: GenerationEngine, memory: TranslationMemory,
+                             language: str = "Hindi") -> List[str]:
+    """
+    Translate segments concurrently, reusing the translation memory where it has them.
+
+    Blank segments pass through, and each distinct segment is translated once.
+    If any request fails the error is raised, but the segments that did
+    succeed are already in the memory, so a retry only redoes the rest.
+
+    Args:
+        segments (List[str]): English text segments, in order.
+        engine (GenerationEngine): Engine the requests are sent through.
+        memory (TranslationMemory): Memory consulted before and updated after each request.
+        language (str): Target language.
+
+    Returns:
+        List[str]: The translated segments, in the same order.
+    """
+    translations: Dict[str, str] = {}
+    pending = []
+    for segment in segments:
+        if not segment.strip() or segment in translations or segment in pending:
+            continue
+        found = memory.lookup(segment, language)
+        if found is None:
+            pending.append(segment)
+        else:
+            translations[segment] = found
+
+    async def translate(segment: str) -> str:
+        response = await engine.chat(
+            messages=[
+                {"role": "system", "content": SEGMENT_SYSTEM_PROMPT.format(language=language)},
+                {"role": "user", "content": segment},
+            ]
+        )
+        target = response.strip()
+        memory.add(segment, target, language)
+        return target
+
+    translated = await asyncio.gather(*(translate(segment) for segment in pending), return_exceptions=True)
+    for segment, target in zip(pending, translated):
+        if isinstance(target, BaseException):
+            raise target
+        translations[segment] = target
+    return [translations.get(segment, segment) for segment in segments]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the translation memory")
+    parser.parse_args()
+
+    memory = TranslationMemory()
+    try:
+        for language, count in memory.summary().items():
+            print(f"{language}: {count} segments")
+    finally:
+        memory.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#url_index.py
+
+import sqlite3
+import threading
+from datetime import datetime
+
+from state_files import default_data_path
+
+
+class SeenUrlIndex:
+    """Persistent record of article URLs that have already been scraped.
+
+    SQLite is the durable copy; the URLs are also held in a set so membership
+    checks stay O(1) during a crawl. Safe to share between crawl threads.
+    """
+    def __init__(self, db_path=None):
+        self.db_path = db_path or default_data_path("seen_urls.db")
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_urls (
+                url TEXT PRIMARY KEY,
+                first_seen TEXT NOT NULL
+            )
+        """)
+        self.conn.commit()
+        self.urls = {row[0] for row in self.conn.execute("SELECT url FROM seen_urls")}
+
+    def __contains__(self, url):
+        return url in self.urls
+
+    def __len__(self):
+        return len(self.urls)
+
+    def add(self, url):
+        """Record a URL as scraped"""
+        with self.lock:
+            if url in self.urls:
+                return
+            self.urls.add(url)
+            self.conn.execute(
+                "INSERT OR IGNORE INTO seen_urls (url, first_seen) VALUES (?, ?)",
+                (url, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()